@@ -1,80 +1,175 @@
+import asyncio
 import boto3
 from AIML_1013_Project1.configuration.aws_connection import S3Client
-from io import StringIO
-from typing import Union, List
+from io import BytesIO, TextIOWrapper
+from typing import Iterator, Optional, TextIO, Union, List, Tuple
 import os, sys
 from AIML_1013_Project1.logger import logging
 from mypy_boto3_s3.service_resource import Bucket
 from AIML_1013_Project1.exceptions import custom_exception
 from botocore.exceptions import ClientError
-from pandas import DataFrame, read_csv
-import pickle
+from boto3.s3.transfer import TransferConfig
+from pandas import DataFrame
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from pyarrow import fs as pa_fs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from AIML_1013_Project1.constants import (
+    REGION_NAME,
+    S3_MAX_WORKERS,
+    S3_MULTIPART_THRESHOLD,
+    S3_MULTIPART_CHUNKSIZE,
+    S3_TRANSFER_MAX_CONCURRENCY,
+)
+import gzip
+import shutil
+import joblib
+import tempfile
+from functools import lru_cache
+from itertools import islice
+
+# pandas' default NA markers plus the "na" marker used in the source data
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null", "na",
+]
+
+# Module logger for per-call tracing in hot helpers. The project root logger runs at DEBUG, so this
+# one is pinned to INFO: the debug calls become a level check instead of formatting + a file write
+# under the handler lock. Lower it to DEBUG when tracing S3 calls.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+@lru_cache(maxsize=8)
+def _bucket(s3_resource, bucket_name: str) -> Bucket:
+    # Bucket handles are stateless wrappers around the name; build each one once
+    return s3_resource.Bucket(bucket_name)
+
 
 class SimpleStorageService:
 
+    # Worker pool shared by all instances for concurrent transfers (boto3 clients are thread-safe)
+    _pool = None
+
     def __init__(self):
 
+        # Client and resource come from aws_connection's per-region cache, so every instance
+        # shares one session and connection pool
         s3_client = S3Client()
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
 
+        if SimpleStorageService._pool is None:
+            SimpleStorageService._pool = ThreadPoolExecutor(max_workers=S3_MAX_WORKERS)
+        self._pool = SimpleStorageService._pool
+
+        # Files above the threshold are split into parts uploaded concurrently by s3transfer
+        self._transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_TRANSFER_MAX_CONCURRENCY,
+            use_threads=True,
+        )
+
+        # Arrow's native S3 filesystem, created on first parquet read
+        self._arrow_fs = None
+
     def s3_key_path_available(self, bucket_name, s3_key) -> bool:
 
         try:
-            bucket = self.get_bucket(bucket_name)
-            # Collect all objects matching the provided prefix
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=s3_key)]
+            # A single-key ListObjectsV2 page is enough to know whether the prefix exists
+            response = self.s3_client.list_objects_v2(Bucket=bucket_name, Prefix=s3_key, MaxKeys=1)
             # Presence of any matching object implies availability
-            if len(file_objects) > 0:
-                return True
-            else:
-                return False
+            return response.get("KeyCount", 0) > 0
         except Exception as e:
             raise custom_exception(e, sys)
 
+    def s3_object_exists(self, bucket_name: str, s3_key: str) -> bool:
+
+        try:
+            # HEAD on the exact key; no listing involved
+            self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise custom_exception(e, sys) from e
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    def get_object_etag(self, bucket_name: str, s3_key: str) -> Optional[str]:
+
+        try:
+            # One HEAD answers both "does it exist" and "which version is it"
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            return response["ETag"].strip('"')
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise custom_exception(e, sys) from e
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
     @staticmethod
-    def read_object(object_name: str, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
+    def read_object(object_name: str, decode: bool = True, make_readable: bool = False) -> Union[TextIO, str, bytes]:
 
-        logging.info("Entered the read_object method of S3Operations class")
+        logger.debug("Entered the read_object method of S3Operations class")
 
         try:
-            # Choose raw or decoded read function based on `decode`
-            func = (
-                lambda: object_name.get()["Body"].read().decode()
-                if decode is True
-                else object_name.get()["Body"].read()
-            )
-            # Optionally convert to StringIO for downstream CSV/readers
-            conv_func = lambda: StringIO(func()) if make_readable is True else func()
-            logging.info("Exited the read_object method of S3Operations class")
-            return conv_func()
+            body = object_name.get()["Body"]
+            if make_readable is True:
+                # Text stream decoded chunk by chunk as the reader consumes it; nothing is buffered up front
+                content = TextIOWrapper(body, encoding="utf-8")
+            elif decode is True:
+                content = body.read().decode("utf-8")
+            else:
+                content = body.read()
+            logger.debug("Exited the read_object method of S3Operations class")
+            return content
 
         except Exception as e:
             raise custom_exception(e, sys) from e
 
     def get_bucket(self, bucket_name: str) -> Bucket:
 
-        logging.info("Entered the get_bucket method of S3Operations class")
+        logger.debug("Entered the get_bucket method of S3Operations class")
 
         try:
-            bucket = self.s3_resource.Bucket(bucket_name)
-            logging.info("Exited the get_bucket method of S3Operations class")
+            bucket = _bucket(self.s3_resource, bucket_name)
+            logger.debug("Exited the get_bucket method of S3Operations class")
             return bucket
         except Exception as e:
             raise custom_exception(e, sys) from e
 
+    def iter_file_objects(self, filename: str, bucket_name: str, page_size: int = 1000) -> Iterator[object]:
+
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            pages = paginator.paginate(
+                Bucket=bucket_name, Prefix=filename, PaginationConfig={"PageSize": page_size}
+            )
+            # Lazily yield one object handle per key, fetching pages only as needed
+            for page in pages:
+                for content in page.get("Contents", []):
+                    yield self.s3_resource.Object(bucket_name, content["Key"])
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
     def get_file_object(self, filename: str, bucket_name: str) -> Union[List[object], object]:
 
-        logging.info("Entered the get_file_object method of S3Operations class")
+        logger.debug("Entered the get_file_object method of S3Operations class")
 
         try:
-            bucket = self.get_bucket(bucket_name)
-            # Collect all objects with matching prefix
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
-            # Return a single object if exactly one, else the full list
-            func = lambda x: x[0] if len(x) == 1 else x
-            file_objs = func(file_objects)
-            logging.info("Exited the get_file_object method of S3Operations class")
+            file_objects = self.iter_file_objects(filename, bucket_name)
+            # Two keys are enough to tell a single match from many; only drain the rest if needed
+            first_objects = list(islice(file_objects, 2))
+            if len(first_objects) == 1:
+                file_objs = first_objects[0]
+            else:
+                file_objs = first_objects + list(file_objects)
+            logger.debug("Exited the get_file_object method of S3Operations class")
             return file_objs
 
         except Exception as e:
@@ -86,16 +181,24 @@ class SimpleStorageService:
 
         try:
             # Construct full S3 key from optional directory
-            func = (
-                lambda: model_name
-                if model_dir is None
-                else model_dir + "/" + model_name
-            )
-            model_file = func()
-            # Retrieve and read the object, then unpickle
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            model_file = model_name if model_dir is None else f"{model_dir}/{model_name}"
+            # The key is known, so download it directly (no prefix LIST) into a temp file and let
+            # joblib memory-map the array payloads instead of copying them into the process heap
+            with tempfile.NamedTemporaryFile(suffix=".pkl") as model_obj:
+                self.s3_client.download_fileobj(bucket_name, model_file, model_obj, Config=self._transfer_config)
+                model_obj.flush()
+                model_obj.seek(0)
+                if model_obj.read(2) == b"\x1f\x8b":
+                    # Gzipped by the model pusher: joblib cannot memory-map a compressed file, so
+                    # unpack it to a plain temp file first (mapped pages outlive the file's deletion)
+                    model_obj.seek(0)
+                    with gzip.GzipFile(fileobj=model_obj, mode="rb") as src, \
+                            tempfile.NamedTemporaryFile(suffix=".pkl") as plain_obj:
+                        shutil.copyfileobj(src, plain_obj, length=1024 * 1024)
+                        plain_obj.flush()
+                        model = joblib.load(plain_obj.name, mmap_mode="r")
+                else:
+                    model = joblib.load(model_obj.name, mmap_mode="r")
             logging.info("Exited the load_model method of S3Operations class")
             return model
 
@@ -120,7 +223,8 @@ class SimpleStorageService:
                 pass
             logging.info("Exited the create_folder method of S3Operations class")
 
-    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True):
+    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True,
+                    transfer_config: Optional[TransferConfig] = None):
 
         logging.info("Entered the upload_file method of S3Operations class")
 
@@ -129,9 +233,13 @@ class SimpleStorageService:
                 f"Uploading {from_filename} file to {to_filename} file in {bucket_name} bucket"
             )
 
-            # Perform the file upload using the low-level client via resource meta
-            self.s3_resource.meta.client.upload_file(
-                from_filename, bucket_name, to_filename
+            # Perform a (multipart, if large enough) upload through the transfer manager; botocore
+            # retries each request (and each part) on throttling, 5xx and connection errors
+            self.s3_client.upload_file(
+                Filename=from_filename,
+                Bucket=bucket_name,
+                Key=to_filename,
+                Config=transfer_config or self._transfer_config,
             )
 
             logging.info(
@@ -150,41 +258,172 @@ class SimpleStorageService:
         except Exception as e:
             raise custom_exception(e, sys) from e
 
-    def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str,) -> None:
+    def upload_files_bulk(self, pairs: List[Tuple[str, str]], bucket_name: str, remove: bool = True) -> None:
 
-        logging.info("Entered the upload_df_as_csv method of S3Operations class")
+        logging.info("Entered the upload_files_bulk method of S3Operations class")
 
         try:
-            # Persist DataFrame locally as CSV
-            data_frame.to_csv(local_filename, index=None, header=True)
+            # One upload per (local file, S3 key) pair, all sharing the same client and connection pool
+            futures = [
+                self._pool.submit(self.upload_file, from_filename, to_filename, bucket_name, remove)
+                for from_filename, to_filename in pairs
+            ]
+            for future in as_completed(futures):
+                future.result()
 
-            # Upload the saved CSV to S3 (may remove local copy depending on upload_file's `remove`)
-            self.upload_file(local_filename, bucket_filename, bucket_name)
+            logging.info("Exited the upload_files_bulk method of S3Operations class")
+
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    async def upload_files_async(self, pairs: List[Tuple[str, str]], bucket_name: str, remove: bool = True) -> None:
+
+        logging.info("Entered the upload_files_async method of S3Operations class")
+
+        try:
+            # Awaitable from an event loop (e.g. a FastAPI route) without blocking it; the uploads
+            # run on the shared pool and client
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[
+                loop.run_in_executor(self._pool, self.upload_file, from_filename, to_filename, bucket_name, remove)
+                for from_filename, to_filename in pairs
+            ])
+
+            logging.info("Exited the upload_files_async method of S3Operations class")
+
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    @staticmethod
+    def _compression_for(key: str) -> Optional[str]:
+        # Compression of a CSV object is inferred from its key, mirroring pandas' path inference
+        return "gzip" if key.endswith(".gz") else None
+
+    def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str,
+                         keep_local: bool = False) -> None:
+
+        logging.info("Entered the upload_df_as_csv method of S3Operations class")
+
+        try:
+            if keep_local is True:
+                # Persist DataFrame locally as CSV and upload that file, keeping the local artifact
+                data_frame.to_csv(local_filename, index=None, header=True,
+                                  compression=self._compression_for(bucket_filename))
+                self.upload_file(local_filename, bucket_filename, bucket_name, remove=False)
+            else:
+                # Serialize in memory and stream straight to S3, skipping the disk round-trip
+                buffer = BytesIO()
+                data_frame.to_csv(buffer, index=None, header=True,
+                                  compression=self._compression_for(bucket_filename))
+                buffer.seek(0)
+                self.s3_client.upload_fileobj(buffer, bucket_name, bucket_filename, Config=self._transfer_config)
 
             logging.info("Exited the upload_df_as_csv method of S3Operations class")
 
         except Exception as e:
             raise custom_exception(e, sys) from e
 
+    def upload_df_as_parquet(self, data_frame: DataFrame, bucket_filename: str, bucket_name: str,
+                             compression: str = "zstd") -> None:
+
+        logging.info("Entered the upload_df_as_parquet method of S3Operations class")
+
+        try:
+            # Columnar encode in Arrow's C++ writer, straight into an in-memory buffer
+            table = pa.Table.from_pandas(data_frame, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            pq.write_table(table, sink, compression=compression)
+
+            self.s3_client.upload_fileobj(
+                pa.BufferReader(sink.getvalue()), bucket_name, bucket_filename, Config=self._transfer_config
+            )
+
+            logging.info("Exited the upload_df_as_parquet method of S3Operations class")
+
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    def read_parquet(self, filename: str, bucket_name: str) -> DataFrame:
+
+        logging.info("Entered the read_parquet method of S3Operations class")
+
+        try:
+            # Credentials come from the same environment variables S3Client relies on
+            if self._arrow_fs is None:
+                self._arrow_fs = pa_fs.S3FileSystem(region=REGION_NAME)
+
+            # Row groups are streamed from S3 and decoded by Arrow, no intermediate bytes copy
+            table = pq.read_table(f"{bucket_name}/{filename}", filesystem=self._arrow_fs)
+            df = table.to_pandas()
+
+            logging.info("Exited the read_parquet method of S3Operations class")
+            return df
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    def _df_from_body(self, body, key: str) -> DataFrame:
+        # Parse the GET stream with Arrow's multi-threaded CSV reader; no full decode to a Python str
+        stream = pa.input_stream(body, compression=self._compression_for(key))
+        table = pa_csv.read_csv(
+            stream,
+            convert_options=pa_csv.ConvertOptions(null_values=CSV_NULL_VALUES, strings_can_be_null=True),
+        )
+        return table.to_pandas(self_destruct=True)
+
     def get_df_from_object(self, object_: object) -> DataFrame:
 
         logging.info("Entered the get_df_from_object method of S3Operations class")
 
         try:
-            content = self.read_object(object_, make_readable=True)
-            df = read_csv(content, na_values="na")
+            df = self._df_from_body(object_.get()["Body"], object_.key)
             logging.info("Exited the get_df_from_object method of S3Operations class")
             return df
         except Exception as e:
             raise custom_exception(e, sys) from e
 
+    def _get_csv(self, key: str, bucket_name: str) -> DataFrame:
+        body = self.s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+        return self._df_from_body(body, key)
+
+    def read_csvs_bulk(self, keys: List[str], bucket_name: str) -> List[DataFrame]:
+
+        logging.info("Entered the read_csvs_bulk method of S3Operations class")
+
+        try:
+            # Concurrent GETs over the shared pool; at most S3_MAX_WORKERS requests are in flight,
+            # which stays within the client's connection pool. Results keep the order of `keys`.
+            dfs = list(self._pool.map(lambda key: self._get_csv(key, bucket_name), keys))
+            logging.info("Exited the read_csvs_bulk method of S3Operations class")
+            return dfs
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    async def read_csvs_async(self, keys: List[str], bucket_name: str) -> List[DataFrame]:
+
+        logging.info("Entered the read_csvs_async method of S3Operations class")
+
+        try:
+            loop = asyncio.get_running_loop()
+            dfs = await asyncio.gather(*[
+                loop.run_in_executor(self._pool, self._get_csv, key, bucket_name) for key in keys
+            ])
+            logging.info("Exited the read_csvs_async method of S3Operations class")
+            return list(dfs)
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
     def read_csv(self, filename: str, bucket_name: str) -> DataFrame:
 
         logging.info("Entered the read_csv method of S3Operations class")
 
         try:
-            csv_obj = self.get_file_object(filename, bucket_name)
-            df = self.get_df_from_object(csv_obj)
+            try:
+                # Fast path: `filename` is a full key, a single GET is enough
+                df = self._get_csv(filename, bucket_name)
+            except self.s3_client.exceptions.NoSuchKey:
+                # `filename` is a prefix, resolve the matching object first
+                csv_obj = self.get_file_object(filename, bucket_name)
+                df = self.get_df_from_object(csv_obj)
             logging.info("Exited the read_csv method of S3Operations class")
             return df
         except Exception as e:
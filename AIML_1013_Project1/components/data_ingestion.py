@@ -1,14 +1,19 @@
 import os 
 import sys 
+import math
+import numpy as np
 import pandas as pd 
-from pandas import DataFrame
-from sklearn.model_selection import train_test_split
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from AIML_1013_Project1.entity.config_entity import DataIngestionConfig
 from AIML_1013_Project1.entity.artifact_entity import DataIngestionArtifact
 
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 from AIML_1013_Project1.database_access.mongo_extract import project1Data
+from AIML_1013_Project1.constants import SCHEMA_FILE_PATH
+from AIML_1013_Project1.utils import convert_csv_to_parquet, read_yaml_file
 
 
 class DataIngestion:
@@ -19,62 +24,117 @@ class DataIngestion:
         """
         try:
             self.data_ingestion_config = data_ingestion_config
+            # Background workers for file writes that can overlap with CPU work
+            # (feature store, train and test files)
+            self._pool = ThreadPoolExecutor(max_workers=3)
         except Exception as e:
             raise custom_exception(e, sys)
-    
-    def export_data_into_feature_store(self) -> DataFrame:
+
+    def write_parquet_copies(self) -> tuple:
         """
-        Method Name: export_data_into_feature_store
-        Description: This method exports data from mongodb to csv file
+        Method Name: write_parquet_copies
+        Description: This method writes a zstd-compressed parquet copy next to the train and test csv files
+                     (same name, .parquet extension); downstream readers prefer it, skipping csv parsing
+                     and reading only the columns they need
 
-        Output: data is returned as an artifact of the data ingestion component 
-        On Failure: write an exception log and then raise an exception
+        Output: train.parquet and test.parquet are written to disk; the (train, test) arrow tables
+                that were written are returned for in-process hand-over
+        On Failure: Write an exception log and raise an exception
         """
-        try: 
-            logging.info(f"Exporting data from mongodb")
-            project1_data = TelcoData()
-            dataframe = project1_data.export_collection_as_dataframe(collection_name=self.data_ingestion_config.collection_name)
-            logging.info(f"Shape of the dataframe: {dataframe.shape}")
-            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-            logging.info(f"Saving exported data into feature store file: {feature_store_file_path}")
-            dataframe.to_csv(feature_store_file_path, index = False, header = True)
-            return dataframe 
-        
-        except Exception as e: 
-            raise custom_exception(e, sys)
-        
-    def split_data_as_train_test(self, dataframe: DataFrame) -> None: 
+        try:
+            futures = [
+                self._pool.submit(convert_csv_to_parquet, self.data_ingestion_config.training_file_path, return_table=True),
+                self._pool.submit(convert_csv_to_parquet, self.data_ingestion_config.testing_file_path, return_table=True),
+            ]
+            tables = tuple(future.result() for future in futures)
+            logging.info("Wrote parquet copies of the train and test files")
+            return tables
+
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    @staticmethod
+    def _feature_store_schema(table: pa.Table) -> pa.Schema:
+        """
+        Writer schema for the feature store, fixed before the first row group is written so every
+        batch can be cast to it: the schema file's int/float fields are float64 (as the mongo reader
+        fills them), its category fields and any field not in the file keep the first batch's type,
+        and a field the first batch only saw as nulls becomes string instead of null
+        """
+        schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+        schema_types = {column: column_type for column_types in schema_config["columns"]
+                        for column, column_type in column_types.items()}
+        fields = []
+        for field in table.schema:
+            if schema_types.get(field.name) in ("int", "float"):
+                field = field.with_type(pa.float64())
+            elif pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return pa.schema(fields)
+
+    def export_and_split_in_batches(self) -> int:
         """
-        Method Name: split_data_as_train_test
-        Description: This method splits the dataframe into train/test based on a split ratio
+        Method Name: export_and_split_in_batches
+        Description: This method streams the collection from mongodb in fixed-size batches, appends each batch
+                     to the parquet feature store as a row group and splits each batch into train and test
+                     (test size rounded up, rows drawn from a generator seeded by the config), appending each
+                     part to the matching csv file
 
-        Output: Folder is created in s3 bucket 
+        Output: number of rows exported; feature store, train and test files are written to disk
         On Failure: Write an exception log and raise an exception
         """
-        logging.info("Entered the split_data_as_train_test method of Data_Ingestion Class")
-        
-        try: 
-            if dataframe.empty:
-                raise ValueError("The dataframe is empty. Please check the data loading process.")
-            
-            train_set, test_set = train_test_split(dataframe, test_size=self.data_ingestion_config.train_test_split_ratio)
-            logging.info("Performed train test split on the dataframe")
-            logging.info("Exited the split_as_train_test_data method of Data_Ingestion Class")
+        logging.info("Entered the export_and_split_in_batches method of Data_Ingestion Class")
 
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-
-            logging.info(f"Exporting train and test file path.")
-            train_set.to_csv(self.data_ingestion_config.testing_file_path, index = False, header = True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path, index = False, header = True)
+        try:
+            config = self.data_ingestion_config
+            for file_path in (config.feature_store_file_path, config.training_file_path):
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+            rng = np.random.default_rng(config.random_state)
+            writer = None
+            columns = None
+            n_rows = 0
+            try:
+                batches = project1Data().iter_collection_batches(
+                    collection_name=config.collection_name, batch_size=config.batch_size
+                )
+                for batch in batches:
+                    is_first_batch = writer is None
+                    if is_first_batch:
+                        columns = list(batch.columns)
+                    else:
+                        # Keep every batch aligned with the first one's columns
+                        batch = batch.reindex(columns=columns)
+
+                    # Append the train/test rows in the background while the row group is encoded
+                    n_test = math.ceil(len(batch) * config.train_test_split_ratio)
+                    is_test = np.zeros(len(batch), dtype=bool)
+                    is_test[rng.permutation(len(batch))[:n_test]] = True
+                    mode = "w" if is_first_batch else "a"
+                    split_futures = [
+                        self._pool.submit(batch[~is_test].to_csv, config.training_file_path, mode = mode, index = False, header = is_first_batch),
+                        self._pool.submit(batch[is_test].to_csv, config.testing_file_path, mode = mode, index = False, header = is_first_batch),
+                    ]
+
+                    table = pa.Table.from_pandas(batch, preserve_index=False)
+                    if is_first_batch:
+                        writer = pq.ParquetWriter(config.feature_store_file_path, self._feature_store_schema(table), compression="zstd")
+                    writer.write_table(table.cast(writer.schema))
+
+                    for future in split_futures:
+                        future.result()
+                    n_rows += len(batch)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            logging.info(f"Exported {n_rows} rows into the feature store and train/test files")
+            logging.info("Exited the export_and_split_in_batches method of Data_Ingestion Class")
+            return n_rows
 
-            logging.info(f"Exported train and test file path.")
-        
         except Exception as e:
             raise custom_exception(e, sys) from e
-        
 
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         """
@@ -87,20 +147,24 @@ class DataIngestion:
         logging.info("Entered the initiate_data_ingestion method of the Data_Ingestion class")
 
         try: 
-            dataframe = self.export_data_into_feature_store()
+            # Stream mongo -> feature store + train/test in bounded-memory batches
+            n_rows = self.export_and_split_in_batches()
             logging.info("Got the data from mongo")
 
-            if dataframe.empty:
+            if n_rows == 0:
                 raise ValueError("The dataframe fetched from Mongo is empty. Please check the data loading process")
-            
-            self.split_data_as_train_test(dataframe)
             logging.info("Performed train test split on the dataset")
 
+            # Parquet copies on disk; the same tables are passed on in memory to the next stages
+            train_table, test_table = self.write_parquet_copies()
+
             logging.info("Exited initiate_data_ingestion method")
 
             data_ingestion_artifact = DataIngestionArtifact(
                 trained_file_path=self.data_ingestion_config.training_file_path,
-                test_file_path=self.data_ingestion_config.testing_file_path
+                test_file_path=self.data_ingestion_config.testing_file_path,
+                train_table=train_table,
+                test_table=test_table,
             )
 
             logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
@@ -7,20 +7,23 @@ for:
 - Reading datasets
 - Building a scikit-learn `ColumnTransformer` that applies:
   * One-hot encoding for nominal categorical features
-  * Ordinal encoding for ordered categorical features
+  * Ordinal encoding (categorical codes) for ordered categorical features
   * Standardization for numeric features
-- Performing class balancing using SMOTEENN
+- Performing class balancing using SMOTE oversampling followed by ENN cleaning
 - Persisting transformed artifacts and NumPy arrays
  
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
-from imblearn.combine import SMOTEENN
+import scipy.sparse as sp
+from sklearn.impute import SimpleImputer
+from sklearn.neighbors import NearestNeighbors
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler, OrdinalEncoder
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.compose import ColumnTransformer
 
 from AIML_1013_Project1.constants import TARGET_COLUMN, SCHEMA_FILE_PATH
@@ -37,9 +40,49 @@ from AIML_1013_Project1.utils import (
     save_object,
     save_numpy_array_data,
     read_yaml_file,
-    drop_columns,
 )
-from AIML_1013_Project1.entity.estimator import TargetValueMapping
+from AIML_1013_Project1.entity.estimator import TargetValueMapping, CategoricalCodeEncoder
+
+
+def _build_preprocessor_factory(schema_config: dict):
+    """
+    Resolve the schema's column groups and return a factory for unfitted preprocessors.
+
+    Each call of the returned function builds a fresh `ColumnTransformer` with:
+    - OneHotEncoder for nominal categorical columns (schema: `oh_columns`)
+    - CategoricalCodeEncoder for ordinal categorical columns (schema: `or_columns`)
+    - Median imputation + StandardScaler for numeric features (schema: `transform_columns`)
+    """
+    oh_columns = list(schema_config["oh_columns"])
+    or_columns = list(schema_config["or_columns"])
+    num_features = list(schema_config["transform_columns"])
+
+    def make_preprocessor() -> ColumnTransformer:
+        # Sparse-friendly: one-hot output stays CSR and the scaler does not center
+        # (centering would densify the matrix).
+        # Blanks coerced to NaN on read are filled with the training median, which is
+        # persisted with the fitted preprocessor and reused for test/inference data.
+        numerical_transformer = Pipeline(steps=[
+            ("SimpleImputer", SimpleImputer(strategy="median")),
+            ("StandardScaler", StandardScaler(with_mean=False)),
+        ])
+        oh_transformer = OneHotEncoder(sparse_output=True, handle_unknown="ignore", dtype=np.float32)
+        ordinal_encoder = CategoricalCodeEncoder()
+
+        # Create composite preprocessor across column subsets; always emit a single CSR matrix.
+        # The column groups are independent, so their transformers run in parallel.
+        return ColumnTransformer(
+            transformers=[
+                ("OneHotEncoder", oh_transformer, oh_columns),
+                ("OrdinalEncoder", ordinal_encoder, or_columns),
+                ("StandardScaler", numerical_transformer, num_features),
+            ],
+            sparse_threshold=1.0,
+            n_jobs=-1,
+            verbose_feature_names_out=False,
+        )
+
+    return make_preprocessor
 
 
 class DataTransformation:
@@ -108,18 +151,34 @@ class DataTransformation:
             self.data_validation_artifact = data_validation_artifact
             # Load schema YAML containing column groups and other directives.
             self.schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            # Preprocessor factory specialized to this schema, so an edited schema is picked
+            # up by the next pipeline run in a long-lived process
+            self._make_preprocessor = _build_preprocessor_factory(self.schema_config)
         except Exception as e:
             raise custom_exception(e, sys)
 
     @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(file_path: str, schema_config: dict = None, table=None) -> pd.DataFrame:
         """
         Read a CSV file into a pandas DataFrame.
 
+        Description
+        -----------
+        Parses with the multi-threaded PyArrow CSV engine, or converts `table` when the
+        file's contents were handed over in memory by ingestion. When a schema is given, the
+        encoder input columns (`oh_columns`, `or_columns`) are read straight into
+        `category` dtype instead of one Python string object per cell, and the numeric
+        columns (`transform_columns`) are coerced once to float32, turning blank or
+        malformed entries (e.g. `TotalCharges`) into NaN.
+
         Parameters
         ----------
         file_path : str
             Absolute or relative path to the CSV file.
+        schema_config : dict, optional
+            Parsed schema YAML used to derive column dtypes.
+        table : pyarrow.Table, optional
+            The file's contents already in memory (see `DataIngestionArtifact.train_table`).
 
         Returns
         -------
@@ -132,7 +191,19 @@ class DataTransformation:
             If the file cannot be read (e.g., missing, malformed).
         """
         try:
-            df = pd.read_csv(file_path)
+            dtype = None
+            if schema_config is not None:
+                categorical_columns = schema_config["oh_columns"] + schema_config["or_columns"]
+                dtype = {column: "category" for column in categorical_columns}
+            if table is not None:
+                df = table.to_pandas()
+                if dtype is not None:
+                    df = df.astype(dtype)
+            else:
+                df = pd.read_csv(file_path, engine="pyarrow", dtype=dtype)
+            if schema_config is not None:
+                num_features = schema_config["transform_columns"]
+                df[num_features] = df[num_features].apply(pd.to_numeric, errors="coerce").astype(np.float32)
             return df
         except Exception as e:
             raise custom_exception(e, sys)
@@ -145,8 +216,11 @@ class DataTransformation:
         -----------
         Constructs a `ColumnTransformer` composed of:
         - OneHotEncoder for nominal categorical columns (from schema: `oh_columns`)
-        - OrdinalEncoder for ordinal categorical columns (from schema: `or_columns`)
-        - StandardScaler for numeric features (from schema: `num_features`)
+        - CategoricalCodeEncoder for ordinal categorical columns (from schema: `or_columns`)
+        - Median imputation + StandardScaler for numeric features (from schema: `transform_columns`)
+
+        The column groups are resolved from `self.schema_config` in `__init__` by
+        `_build_preprocessor_factory`; this method only instantiates a fresh, unfitted transformer.
 
         The transformer is intended to be fitted on the training data and reused
         for inference/transforming test data.
@@ -164,35 +238,246 @@ class DataTransformation:
         logging.info("Entered the get_data_transformer_object method of DataTransformation class")
 
         try:
-            # Instantiate transformers for different feature types.
-            logging.info("Got numerical cols from schema config")
-            numerical_transformer = StandardScaler()
-            oh_transformer = OneHotEncoder()
-            ordinal_encoder = OrdinalEncoder()
-
-            logging.info("Inintialized StandardScaler, OneHotEncoder and OrdinalEncoder")
-
-            # Column groups expected in schema YAML.
-            oh_columns = self.schema_config["oh_columns"]
-            or_columns = self.schema_config["or_columns"]
-            num_features = self.schema_config["num_features"]
-
-            logging.info(f"Initialized Preprocessing")
-
-            # Create composite preprocessor across column subsets.
-            preprocessor = ColumnTransformer(
-                transformers=[
-                    ("OneHotEncoder", oh_transformer, oh_columns),
-                    ("OrdinalEncoder", ordinal_encoder, or_columns),
-                    ("StandardScaler", numerical_transformer, num_features),
-                ]
-            )
+            preprocessor = self._make_preprocessor()
             logging.info("Preprocessing object created")
             return preprocessor
 
         except Exception as e:
             raise custom_exception(e, sys)
 
+    @staticmethod
+    def _neighbors_algorithm(n_features: int, sparse_input: bool) -> str:
+        # Tree indexes need dense input and lose to brute force once the matrix gets wide.
+        return "brute" if sparse_input or n_features >= 50 else "kd_tree"
+
+    @staticmethod
+    def _generate_synthetic_samples(
+        minority_features: np.ndarray, neighbor_indices: np.ndarray, n_samples: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Generate SMOTE samples `x_i + alpha * (x_nn - x_i)` for randomly drawn pairs.
+
+        All samples are produced in one vectorized pass: base rows, one of their k
+        neighbours and the interpolation factors are drawn as arrays, and the output
+        buffer is filled in place.
+
+        Parameters
+        ----------
+        minority_features : np.ndarray
+            Dense float32 rows of the minority class.
+        neighbor_indices : np.ndarray
+            (n_minority, k) indices into `minority_features` of each row's k nearest
+            neighbours, the row itself excluded.
+        n_samples : int
+            Number of synthetic rows to generate.
+        rng : np.random.Generator
+            Source of randomness.
+
+        Returns
+        -------
+        np.ndarray
+            (n_samples, n_features) float32 synthetic rows.
+        """
+        n_minority, k = neighbor_indices.shape
+        base_rows = rng.integers(0, n_minority, size=n_samples)
+        neighbor_rows = neighbor_indices[base_rows, rng.integers(0, k, size=n_samples)]
+        alpha = rng.random((n_samples, 1), dtype=np.float32)
+
+        base = minority_features[base_rows]
+        out = minority_features[neighbor_rows]
+        out -= base
+        out *= alpha
+        out += base
+        return out
+
+    def oversample_minority(self, features, target: np.ndarray, nn: NearestNeighbors, sparse_input: bool = False):
+        """
+        SMOTE oversampling of the minority class up to the size of the majority class.
+
+        Description
+        -----------
+        Equivalent to imblearn's `SMOTE(sampling_strategy="minority", k_neighbors=5)`.
+        Only the minority rows are densified (for sparse input) to search their
+        neighbours and interpolate; the synthetic rows are then appended in the
+        input's format.
+
+        Parameters
+        ----------
+        features : np.ndarray or scipy.sparse.csr_matrix
+            Transformed training features.
+        target : np.ndarray
+            Encoded training target.
+        nn : NearestNeighbors
+            Neighbour search estimator shared with the cleaning step; refitted here on
+            the minority rows.
+        sparse_input : bool, default False
+            Whether `features` is a CSR matrix.
+
+        Returns
+        -------
+        Tuple
+            Features and target with the synthetic minority rows appended.
+        """
+        classes, counts = np.unique(target, return_counts=True)
+        minority_class = classes[np.argmin(counts)]
+        n_samples = int(counts.max() - counts.min())
+        if n_samples == 0:
+            return features, target
+
+        minority_features = features[target == minority_class]
+        if sparse_input:
+            minority_features = minority_features.toarray()
+        minority_features = np.ascontiguousarray(minority_features, dtype=np.float32)
+
+        nn.set_params(algorithm=self._neighbors_algorithm(features.shape[1], sparse_input=False))
+        nn.fit(minority_features)
+        # k_neighbors=5 plus the sample itself
+        neighbor_indices = nn.kneighbors(minority_features, n_neighbors=6, return_distance=False)[:, 1:]
+
+        synthetic = self._generate_synthetic_samples(
+            minority_features, neighbor_indices, n_samples, np.random.default_rng()
+        )
+        if sparse_input:
+            features = sp.vstack([features, sp.csr_matrix(synthetic)], format="csr")
+        else:
+            features = np.concatenate([features, synthetic.astype(features.dtype, copy=False)])
+        target = np.concatenate([target, np.full(n_samples, minority_class, dtype=target.dtype)])
+        return features, target
+
+    def clean_with_enn(self, features, target: np.ndarray, nn: NearestNeighbors, sparse_input: bool = False):
+        """
+        Edited Nearest Neighbours cleaning over all classes.
+
+        Description
+        -----------
+        Equivalent to imblearn's `EditedNearestNeighbours(sampling_strategy="all",
+        n_neighbors=3, kind_sel="all")`: a row is kept only if all of its 3 nearest
+        neighbours share its label. The neighbour labels of every row are gathered at
+        once and compared with a single boolean mask.
+
+        Parameters
+        ----------
+        features : np.ndarray or scipy.sparse.csr_matrix
+            Oversampled training features.
+        target : np.ndarray
+            Matching target.
+        nn : NearestNeighbors
+            Neighbour search estimator shared with the oversampling step; refitted here
+            on the oversampled rows.
+        sparse_input : bool, default False
+            Whether `features` is a CSR matrix.
+
+        Returns
+        -------
+        Tuple
+            Features and target with the noisy rows removed.
+        """
+        nn.set_params(algorithm=self._neighbors_algorithm(features.shape[1], sparse_input))
+        nn.fit(features)
+        # n_neighbors=3 plus the sample itself
+        neighbor_labels = target[nn.kneighbors(features, n_neighbors=4, return_distance=False)[:, 1:]]
+        keep_mask = (neighbor_labels == target[:, None]).all(axis=1)
+        return features[keep_mask], target[keep_mask]
+
+    def resample_training_data(self, features, target: np.ndarray):
+        """
+        Balance the training split: SMOTE oversampling followed by ENN cleaning.
+
+        Description
+        -----------
+        Same two steps as `SMOTEENN`, run separately so a sparse (CSR) preprocessor
+        output is resampled as is; the matrix is only densified once, after cleaning,
+        instead of materializing the full one-hot matrix up front.
+
+        Parameters
+        ----------
+        features : np.ndarray or scipy.sparse matrix
+            Transformed training features.
+        target : np.ndarray
+            Encoded training target.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Dense resampled features and the matching target.
+        """
+        sparse_input = sp.issparse(features)
+        if sparse_input:
+            features = features.tocsr()
+
+        # One neighbour-search estimator serves both steps; each step passes its own k.
+        nn = NearestNeighbors(n_jobs=-1)
+        features, target = self.oversample_minority(features, target, nn, sparse_input)
+        features, target = self.clean_with_enn(features, target, nn, sparse_input)
+
+        if sp.issparse(features):
+            features = features.toarray()
+        return features, target
+
+    @staticmethod
+    def _concat_features_and_target(features: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """
+        Append the target as the last column of a float32 array.
+
+        The output is allocated once in column-major order and filled by slice assignment,
+        so no intermediate array is built and each column (including the target split off
+        downstream with `arr[:, -1]`) is contiguous in memory.
+        """
+        n_rows, n_features = features.shape
+        out = np.empty((n_rows, n_features + 1), dtype=np.float32, order="F")
+        out[:, :n_features] = features
+        out[:, n_features] = target
+        return out
+
+    @staticmethod
+    def _get_column_indices(preprocessor: ColumnTransformer, columns: pd.Index) -> list:
+        """
+        Resolve the fitted transformers' column names to positions once.
+
+        Parameters
+        ----------
+        preprocessor : ColumnTransformer
+            Fitted preprocessor.
+        columns : pd.Index
+            Column labels of the frames that will be transformed.
+
+        Returns
+        -------
+        list of (transformer, np.ndarray)
+            Fitted sub-transformers in output order, each with the positional indices
+            of its input columns. Dropped and empty column groups are skipped.
+
+        Raises
+        ------
+        ValueError
+            If a column the preprocessor was fitted on is missing from `columns`.
+        """
+        column_indices = []
+        for _, transformer, transformer_columns in preprocessor.transformers_:
+            if transformer == "drop" or len(transformer_columns) == 0:
+                continue
+            indices = columns.get_indexer(transformer_columns)
+            if (indices < 0).any():
+                missing = [c for c, i in zip(transformer_columns, indices) if i < 0]
+                raise ValueError(f"Columns {missing} are missing from the dataframe")
+            column_indices.append((transformer, indices))
+        return column_indices
+
+    @staticmethod
+    def _transform_by_position(column_indices: list, dataframe: pd.DataFrame):
+        """
+        Apply the fitted sub-transformers using cached column positions.
+
+        Equivalent to `preprocessor.transform(dataframe)` for frames laid out like the one
+        the indices were resolved against, without re-resolving column labels per call.
+        Output blocks are stacked in the preprocessor's order into a single CSR matrix.
+        """
+        blocks = [
+            transformer.transform(dataframe.iloc[:, indices])
+            for transformer, indices in column_indices
+        ]
+        return sp.hstack(blocks, format="csr")
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         """
         Execute the full transformation workflow and persist artifacts.
@@ -201,15 +486,15 @@ class DataTransformation:
         --------
         1) Check validation status from `data_valiation_artifact` (as named).
         2) Build preprocessing transformer via `get_data_transformer_object()`.
-        3) Read train and test CSVs using `DataTransformation.read_data`.
-        4) Split features/target using `TARGET_COLUMN`.
-        5) Optionally drop columns as specified by schema (`drop_columns`).
-        6) Encode the target labels using `TargetValueMapping`.
-        7) Fit/transform training features; transform test features.
-        8) Apply SMOTEENN to address class imbalance on train and test.
-        9) Concatenate features and target back into NumPy arrays.
-        10) Save preprocessor and transformed arrays via project utilities.
-        11) Return a `DataTransformationArtifact` with output file paths.
+        3) Read train and test CSVs concurrently using `DataTransformation.read_data`.
+        4) Split features/target using `TARGET_COLUMN`, keeping only the columns not
+           listed in the schema's `drop_cols`.
+        5) Encode the target labels using `TargetValueMapping`.
+        6) Fit/transform training features; transform test features.
+        7) Apply SMOTEENN to address class imbalance on the training split only.
+        8) Concatenate features and target back into NumPy arrays.
+        9) Save preprocessor and transformed arrays via project utilities.
+        10) Return a `DataTransformationArtifact` with output file paths.
 
         Returns
         -------
@@ -232,44 +517,45 @@ class DataTransformation:
                 preprocessor = self.get_data_transformer_object()
                 logging.info("Got the preprocessor object")
 
-                # Read the train and test datasets.
+                # Read the train and test datasets concurrently (CSV parsing releases the GIL).
                 # NOTE: Attribute name `trained_file_path` is preserved as given.
-                train_df = DataTransformation.read_data(
-                    file_path=self.data_ingestion_artifact.trained_file_path
-                )
-                test_df = DataTransformation.read_data(
-                    file_path=self.data_ingestion_artifact.test_file_path
-                )
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    train_future = executor.submit(
+                        DataTransformation.read_data,
+                        self.data_ingestion_artifact.trained_file_path, self.schema_config,
+                        self.data_ingestion_artifact.train_table
+                    )
+                    test_future = executor.submit(
+                        DataTransformation.read_data,
+                        self.data_ingestion_artifact.test_file_path, self.schema_config,
+                        self.data_ingestion_artifact.test_table
+                    )
+                    train_df, test_df = train_future.result(), test_future.result()
+
+                # Label -> code lookup shared by both splits.
+                target_mapping = TargetValueMapping()._asdict()
+
+                # Feature columns = everything except the target and the schema's drop_cols.
+                # Resolved once and reused for both splits, so each split is selected in a
+                # single pass instead of a target drop followed by a column drop.
+                excluded_cols = set(self.schema_config["drop_cols"]) | {TARGET_COLUMN}
+                keep_cols = [col for col in train_df.columns if col not in excluded_cols]
+                logging.info(f"Dropping columns {sorted(excluded_cols)} from the train and test dataframes")
 
                 # Split into input features and target for training set.
-                input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+                input_feature_train_df = train_df[keep_cols]
                 target_feature_train_df = train_df[TARGET_COLUMN]
 
                 logging.info("Got train features and test features of Training dataset")
 
-           
-                drop_cols = self.schema_config["drop_columns"] #realized had the issue of same name
-                input_feature_train_df = drop_columns(df=input_feature_train_df, cols=drop_cols)#change here
-
-                logging.info(f"Dropping columns {drop_columns} from the train and test dataframes")
-
-                # Map target labels to numeric values using TargetValueMapping.
-                target_feature_train_df = target_feature_train_df.replace(
-                    TargetValueMapping()._asdict()
-                )
+                # Map target labels to numeric values using TargetValueMapping (vectorized lookup).
+                target_feature_train_df = target_feature_train_df.map(target_mapping).astype(np.int8)
 
                 # Prepare test feature/target splits.
-                input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+                input_feature_test_df = test_df[keep_cols]
                 target_feature_test_df = test_df[TARGET_COLUMN]
 
-           
-                input_feature_test_df = drop_columns(df=input_feature_test_df, cols=drop_cols)#change here
-
-                logging.info("drop the columns in drop_cols of Test dataset")
-
-                target_feature_test_df = target_feature_test_df.replace(
-                    TargetValueMapping()._asdict()
-                )
+                target_feature_test_df = target_feature_test_df.map(target_mapping).astype(np.int8)
 
                 logging.info("Got train features and test features of Testing dataset")
 
@@ -277,46 +563,50 @@ class DataTransformation:
                     "Applying preprocessing object on training dataframe and testing dataframe"
                 )
 
-                # Fit the preprocessor on training features and transform them.
-                input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df)
+                # Fit the preprocessor on training features and transform them (float32 halves the
+                # bytes moved by resampling and by every downstream read of the arrays).
+                input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df).astype(np.float32, copy=False)
                 logging.info("Used the preprocessor object to fit transform the train features")
 
-                # Transform test features using the already-fitted preprocessor.
-                input_feature_test_arr = preprocessor.transform(input_feature_test_df)
+                # Transform test features with the fitted sub-transformers, selecting their
+                # columns by positions resolved once instead of by label on every call.
+                column_indices = self._get_column_indices(preprocessor, input_feature_test_df.columns)
+                input_feature_test_arr = self._transform_by_position(
+                    column_indices, input_feature_test_df
+                ).astype(np.float32, copy=False)
                 logging.info("Used the preprocessor object to transform the test features")
 
-                # Address class imbalance with SMOTEENN on training set.
-                logging.info("Applying SMOTEENN on Training dataset")
-                smt = SMOTEENN(sampling_strategy="minority")
+                # The test split is not resampled; densify it for saving.
+                if sp.issparse(input_feature_test_arr):
+                    input_feature_test_arr = input_feature_test_arr.toarray()
 
-                input_feature_train_final, target_feature_train_final = smt.fit_resample(
-                    input_feature_train_arr, target_feature_train_df
+                # Address class imbalance with SMOTE + ENN on the (still sparse) training set.
+                logging.info("Applying SMOTEENN on Training dataset")
+                input_feature_train_final, target_feature_train_final = self.resample_training_data(
+                    input_feature_train_arr, np.asarray(target_feature_train_df)
                 )
                 logging.info("Applied SMOTEENN on training dataset")
 
-                # Apply SMOTEENN on the test set as well (per provided code).
-                logging.info("Applying SMOTEENN on testing dataset")
-                input_feature_test_final, target_feature_test_final = smt.fit_resample(
-                    input_feature_test_arr, target_feature_test_df
-                )
-                logging.info("Applied SMOTEENN on testing dataset")
+                # The test split is left as observed: resampling it would evaluate on synthetic rows.
+                input_feature_test_final = input_feature_test_arr
+                target_feature_test_final = np.asarray(target_feature_test_df, dtype=np.int8)
 
                 logging.info("Created train array and test array")
 
                 # Concatenate features with target column for both splits.
-                train_arr = np.c_[
-                    input_feature_train_final, np.array(target_feature_train_final)
-                ]
-                test_arr = np.c_[
-                    input_feature_test_final, np.array(target_feature_test_final)
-                ]
+                train_arr = self._concat_features_and_target(
+                    input_feature_train_final, np.asarray(target_feature_train_final, dtype=np.int8)
+                )
+                test_arr = self._concat_features_and_target(
+                    input_feature_test_final, target_feature_test_final
+                )
 
                 # Persist the fitted preprocessor and transformed arrays.
                 save_object(
                     self.data_transformation_config.transformed_object_file_path, preprocessor
                 )
                 save_numpy_array_data(
-                    self.data_transformation_config.transformed_trained_file_path, array=train_arr
+                    self.data_transformation_config.transformed_train_file_path, array=train_arr
                 )
                 save_numpy_array_data(
                     self.data_transformation_config.transformed_test_file_path, array=test_arr
@@ -330,8 +620,10 @@ class DataTransformation:
                 # Package artifact with references to saved file paths.
                 data_transformation_artifact = DataTransformationArtifact(
                     transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
-                    transformed_trained_file_path=self.data_transformation_config.transformed_trained_file_path,
+                    transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
                     transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+                    train_array=train_arr,
+                    test_array=test_arr,
                 )
                 return data_transformation_artifact
 
@@ -14,10 +14,16 @@ and data drift detection for the Telco Churn pipeline. Responsibilities include:
 
 """
 
+import atexit
+import hashlib
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import pandas as pd
+import pyarrow.parquet as pq
 from evidently.model_profile import Profile
 from evidently.model_profile.sections import DataDriftProfileSection
 
@@ -25,12 +31,25 @@ from pandas import DataFrame
 
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
-from AIML_1013_Project1.utils import read_yaml_file, write_yaml_file
+from AIML_1013_Project1.utils import (read_yaml_file, write_yaml_file, file_digest, apply_schema_dtypes, _to_builtin,
+                                     get_parquet_sibling)
 from AIML_1013_Project1.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from AIML_1013_Project1.entity.config_entity import DataValidationConfig
 from AIML_1013_Project1.constants import SCHEMA_FILE_PATH
 
 
+# Background writer for drift reports; shut down (after pending writes finish) at interpreter exit.
+_IO_EXEC = ThreadPoolExecutor(max_workers=2)
+atexit.register(_IO_EXEC.shutdown, wait=True)
+
+
+@lru_cache(maxsize=8)
+def _load_cached_drift_report(cache_file_path: str) -> dict:
+    """Load a cached Evidently drift report (JSON); memoized for reuse within one process."""
+    with open(cache_file_path, "r") as cache_file:
+        return json.load(cache_file)
+
+
 class DataValidation:
     """
     Orchestrates dataset validation for the Telco Churn pipeline.
@@ -58,6 +77,10 @@ class DataValidation:
     _schema_config : dict
         Parsed YAML schema loaded from `SCHEMA_FILE_PATH`. Expected to include keys such as
         "columns", "numerical_columns", and "categorical_columns".
+    _expected_column_count : int
+        Number of entries under the schema's "columns".
+    _num_index, _cat_index : pandas.Index
+        Required numerical / categorical column names.
 
     Raises
     ------
@@ -84,113 +107,109 @@ class DataValidation:
         try:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
-            # Load schema that specifies expected columns and groupings.
+            # Pending background write of the drift report, if any.
+            self._write_future = None
+            # Load schema that specifies expected columns and groupings (parsed once per process).
             self._schema_config =read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            # Derived values used by every check, computed once per instance.
+            self._expected_column_count = len(self._schema_config["columns"])
+            self._num_index = pd.Index(self._schema_config["numerical_columns"])
+            self._cat_index = pd.Index(self._schema_config["categorical_columns"])
+            # Columns compared for drift (sorted union of both groups).
+            self._feature_columns = self._num_index.union(self._cat_index).tolist()
         except Exception as e:
             raise custom_exception(e,sys)
 
-    def validate_number_of_columns(self, dataframe: DataFrame) -> bool:
+    def _validate_schema(self, df: DataFrame, role: str) -> tuple:
         """
-        Validate that the dataframe has the exact number of columns specified by the schema.
-
-        Method Name
-        -----------
-        validate_number_of_columns
-
-        Description
-        -----------
-        Compares the count of columns in the provided dataframe against the schema's
-        "columns" specification. Logs the result and returns a boolean status.
+        Run the column-count and required-column checks in a single pass.
 
         Parameters
         ----------
-        dataframe : pandas.DataFrame
-            The dataframe to validate.
+        df : pandas.DataFrame
+            The dataframe (or zero-row header frame) to validate.
+        role : str
+            Name used in messages, e.g. "training" or "test".
 
         Returns
         -------
-        bool
-            True if the column counts match; False otherwise.
-
-        Raises
-        ------
-        custom_exception
-            If validation fails due to unexpected errors (e.g., schema/key issues).
+        tuple of (bool, str)
+            Whether the dataframe conforms to the schema, and the accumulated error
+            message ("" when it does).
         """
-        try:
-            status = len(dataframe.columns) == len(self._schema_config["columns"])
-            logging.info(f"Is required column present: [{status}]")
-            return status
-        except Exception as e:
-            raise custom_exception(e, sys)
+        errors = []
+        if len(df.columns) != self._expected_column_count:
+            errors.append(f"Column count mismatch in {role} dataframe: "
+                          f"expected {self._expected_column_count}, got {len(df.columns)}.")
+        missing_numerical_columns = self._num_index.difference(df.columns)
+        if not missing_numerical_columns.empty:
+            errors.append(f"Numerical columns missing in {role} dataframe: {missing_numerical_columns.tolist()}.")
+        missing_categorical_columns = self._cat_index.difference(df.columns)
+        if not missing_categorical_columns.empty:
+            errors.append(f"Categorical columns missing in {role} dataframe: {missing_categorical_columns.tolist()}.")
+
+        status = not errors
+        logging.info(f"Schema conformance of {role} dataframe: {status}")
+        return status, " ".join(errors)
 
-    def is_column_exist(self, df: DataFrame) -> bool:
+    @staticmethod
+    def read_header(file_path) -> DataFrame:
         """
-        Validate existence of all expected numerical and categorical columns.
-
-        Method Name
-        -----------
-        is_column_exist
-
-        Description
-        -----------
-        Ensures every column listed under "numerical_columns" and "categorical_columns"
-        in the schema is present in the provided dataframe. Logs any missing columns.
+        Read only the header row of a CSV file.
 
         Parameters
         ----------
-        df : pandas.DataFrame
-            The dataframe to validate.
+        file_path : str
+            Path to the CSV file.
 
         Returns
         -------
-        bool
-            True if all required columns are present; False otherwise.
+        pandas.DataFrame
+            Zero-row dataframe carrying the file's columns, which is all the schema
+            checks need.
 
         Raises
         ------
         custom_exception
-            If an unexpected error occurs during validation.
+            If the file cannot be read for any reason.
         """
         try:
-            dataframe_columns = df.columns
-            missing_numerical_columns = []
-            missing_categorical_columns = []
-            # Check required numerical columns
-            for column in self._schema_config["numerical_columns"]:
-                if column not in dataframe_columns:
-                    missing_numerical_columns.append(column)
-
-            if len(missing_numerical_columns)>0:
-                logging.info(f"Missing numerical column: {missing_numerical_columns}")
-
-            # Check required categorical columns
-            for column in self._schema_config["categorical_columns"]:
-                if column not in dataframe_columns:
-                    missing_categorical_columns.append(column)
-
-            if len(missing_categorical_columns)>0:
-                logging.info(f"Missing categorical column: {missing_categorical_columns}")
-
-            # Return True only if no required columns are missing
-            return False if len(missing_categorical_columns)>0 or len(missing_numerical_columns)>0 else True
+            if os.path.splitext(file_path)[1] == ".parquet":
+                # Column names come from the Parquet footer; no data pages are read
+                return pd.DataFrame(columns=pq.read_schema(file_path).names)
+            return pd.read_csv(file_path, nrows=0)
         except Exception as e:
-            raise custom_exception(e, sys) from e
+            raise custom_exception(e, sys)
 
-    @staticmethod
-    def read_data(file_path) -> DataFrame:
+    def read_data(self, file_path, chunksize: int = None, columns: list = None, table=None) -> DataFrame:
         """
-        Read a CSV file from disk into a pandas DataFrame.
+        Read a CSV or Parquet file from disk into a pandas DataFrame with the schema's
+        compact dtypes.
+
+        An Arrow `table` of the file handed over in memory by ingestion is used as is, without
+        touching the disk. Parquet files skip parsing altogether; for a CSV path, a Parquet sibling written by
+        ingestion (`train.csv` -> `train.parquet`) is preferred when present and read
+        memory-mapped. Otherwise the CSV is parsed by the multi-threaded PyArrow reader,
+        or by the C reader when `chunksize` is given (the PyArrow engine cannot stream
+        chunks).
 
         Parameters
         ----------
         file_path : str
             Path to the CSV file to load.
+        chunksize : int, optional
+            If given, the file is parsed in chunks of this many rows and concatenated,
+            bounding the parser's working memory to one chunk.
+        columns : list, optional
+            Only load these columns (column pruning for Parquet, `usecols` for CSV).
+        table : pyarrow.Table, optional
+            The file's contents already in memory (see `DataIngestionArtifact.train_table`).
 
         Returns
         -------
         pandas.DataFrame
-            Loaded dataframe.
+            Loaded dataframe; categorical schema columns as `category`, numeric ones
+            downcast (e.g. float64 -> float32), see `utils.apply_schema_dtypes`.
 
         Raises
         ------
@@ -198,11 +217,68 @@ class DataValidation:
             If the file cannot be read for any reason.
         """
         try:
-            return pd.read_csv(file_path)
+            parquet_path = file_path if os.path.splitext(file_path)[1] == ".parquet" else get_parquet_sibling(file_path)
+            if table is not None:
+                df = (table if columns is None else table.select(columns)).to_pandas()
+            elif os.path.exists(parquet_path):
+                df = pd.read_parquet(parquet_path, engine="pyarrow", columns=columns, memory_map=True)
+            elif chunksize is None:
+                df = pd.read_csv(file_path, engine="pyarrow", usecols=columns)
+            else:
+                df = pd.concat(pd.read_csv(file_path, engine="c", memory_map=True, low_memory=False,
+                                           usecols=columns, chunksize=chunksize), ignore_index=True)
+            # Applied after concatenation so every chunk shares one set of categories
+            return apply_schema_dtypes(df, self._schema_config)
         except Exception as e:
             raise custom_exception(e, sys)
 
-    def detect_dataset_drift(self, reference_df: DataFrame, current_df: DataFrame, ) -> bool:
+    def get_drift_cache_path(self) -> str:
+        """
+        Path of the cached drift report for the current train/test file contents.
+
+        The key is the BLAKE2b digest of both files plus a digest of the drift settings
+        (the compared schema columns and `max_drift_rows`), so a change to either file
+        (e.g. a new ingestion run) or to those settings misses the cache.
+        """
+        reference_digest = file_digest(self.data_ingestion_artifact.trained_file_path)
+        current_digest = file_digest(self.data_ingestion_artifact.test_file_path)
+        settings_digest = hashlib.blake2b(
+            json.dumps([self._feature_columns, self.data_validation_config.max_drift_rows]).encode(), digest_size=8
+        ).hexdigest()
+        return os.path.join(self.data_validation_config.drift_cache_dir,
+                            f"{reference_digest}_{current_digest}_{settings_digest}.json")
+
+    @staticmethod
+    def write_drift_report(file_path: str, json_report: dict) -> bool:
+        """
+        Write the drift report as YAML unless the same report is already on disk.
+
+        A blake2b hash of the canonical JSON form of the report is kept in a `<file_path>.sha`
+        sidecar; when it matches, the YAML dump is skipped. Otherwise both the YAML and the
+        new sidecar are written.
+
+        Returns
+        -------
+        bool
+            True if the report was written; False if the existing file was kept.
+        """
+        report_hash = hashlib.blake2b(
+            json.dumps(json_report, sort_keys=True, default=_to_builtin).encode(), digest_size=16
+        ).hexdigest()
+        hash_file_path = file_path + ".sha"
+
+        if os.path.exists(file_path) and os.path.exists(hash_file_path):
+            with open(hash_file_path) as hash_file:
+                if hash_file.read().strip() == report_hash:
+                    logging.info(f"Drift report unchanged, keeping {file_path}")
+                    return False
+
+        write_yaml_file(file_path, json_report)
+        with open(hash_file_path, "w") as hash_file:
+            hash_file.write(report_hash)
+        return True
+
+    def detect_dataset_drift(self, reference_df: DataFrame, current_df: DataFrame, cache_file_path: str = None) -> bool:
         """
         Detect dataset drift between a reference (training) and current (testing) dataframe.
 
@@ -214,8 +290,16 @@ class DataValidation:
         -----------
         Uses Evidently's `Profile` with `DataDriftProfileSection` to compute drift metrics.
         Writes the full drift report (JSON) to a YAML file path provided by the
-        `data_validation_config`. Logs the number of drifted features and returns the
-        dataset-level drift status.
+        `data_validation_config` in the background (see `self._write_future`). Logs the
+        number of drifted features and returns the dataset-level drift status.
+
+        When `cache_file_path` points to an existing report, the profile computation is
+        skipped and that report is reused; otherwise the computed report is stored there.
+
+        Only the schema's numerical and categorical columns are compared. Frames larger
+        than `data_validation_config.max_drift_rows` are randomly subsampled
+        (fixed seed) to that many rows first; the statistical tests converge well below
+        the full row count.
 
         Parameters
         ----------
@@ -223,6 +307,8 @@ class DataValidation:
             The reference dataframe (typically training data).
         current_df : pandas.DataFrame
             The current dataframe to compare against the reference (typically testing data).
+        cache_file_path : str, optional
+            Content-addressed location of a cached report (see `get_drift_cache_path`).
 
         Returns
         -------
@@ -235,16 +321,42 @@ class DataValidation:
             If Evidently computation fails or report writing encounters an error.
         """
         try:
-            # Build and compute Evidently drift profile
-            data_drift_profile = Profile(sections=[DataDriftProfileSection()])
-
-            data_drift_profile.calculate(reference_df, current_df)
+            if cache_file_path is not None and os.path.exists(cache_file_path):
+                logging.info(f"Reusing cached drift report: {cache_file_path}")
+                json_report = _load_cached_drift_report(cache_file_path)
+            else:
+                # Only the schema's feature columns are tested: the target (which has its own
+                # drift section) and ID/metadata columns are left out
+                reference_df = reference_df[self._feature_columns]
+                current_df = current_df[self._feature_columns]
+
+                max_drift_rows = self.data_validation_config.max_drift_rows
+                if len(reference_df) > max_drift_rows:
+                    reference_df = reference_df.sample(n=max_drift_rows, random_state=0)
+                if len(current_df) > max_drift_rows:
+                    current_df = current_df.sample(n=max_drift_rows, random_state=0)
+
+                # Build and compute Evidently drift profile
+                data_drift_profile = Profile(sections=[DataDriftProfileSection()])
+
+                data_drift_profile.calculate(reference_df, current_df)
+
+                # Take the report as a dict directly; only fall back to the JSON round-trip
+                # on Evidently versions without `Profile.object()`
+                if hasattr(data_drift_profile, "object"):
+                    json_report = data_drift_profile.object()
+                else:
+                    json_report = json.loads(data_drift_profile.json())
 
-            # Extract JSON and persist via YAML writer for downstream consumption
-            report = data_drift_profile.json()
-            json_report = json.loads(report)
+                if cache_file_path is not None:
+                    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+                    with open(cache_file_path, "w") as cache_file:
+                        json.dump(json_report, cache_file, default=_to_builtin)
 
-            write_yaml_file(file_path=self.data_validation_config.drift_report_file_path, content=json_report)
+            # Persist via YAML writer for downstream consumption (skipped if the report is unchanged)
+            self._write_future = _IO_EXEC.submit(
+                self.write_drift_report, self.data_validation_config.drift_report_file_path, json_report
+            )
 
             # Log summary metrics
             n_features = json_report["data_drift"]["data"]["metrics"]["n_features"]
@@ -267,10 +379,10 @@ class DataValidation:
         Description
         -----------
         Pipeline:
-        1) Load training and testing dataframes from ingestion artifact paths.
-        2) Validate column counts for both dataframes.
-        3) Validate presence of all required numerical and categorical columns.
-        4) If the dataset passes schema checks, detect dataset drift.
+        1) Read only the headers of the training and testing files.
+        2-3) Validate column counts and presence of all required numerical and categorical
+           columns for both dataframes (one `_validate_schema` pass each).
+        4) If the dataset passes schema checks, load both files (in chunks) and detect dataset drift.
         5) Build and return a `DataValidationArtifact` summarizing results and report paths.
 
         Returns
@@ -291,38 +403,39 @@ class DataValidation:
             validation_error_msg = ""
             logging.info("Starting data validation")
 
-            # Read training and testing datasets using paths from the ingestion artifact
-            train_df, test_df = (DataValidation.read_data(file_path=self.data_ingestion_artifact.trained_file_path),
-                                 DataValidation.read_data(file_path=self.data_ingestion_artifact.test_file_path))
-
-            # Validate number of columns for training dataframe
-            status = self.validate_number_of_columns(dataframe=train_df)
-            logging.info(f"All required columns present in training dataframe: {status}")
-            if not status:
-                validation_error_msg += f"Columns are missing in training dataframe."
-
-            # Validate number of columns for testing dataframe
-            status = self.validate_number_of_columns(dataframe=test_df)
-            logging.info(f"All required columns present in testing dataframe: {status}")
-            if not status:
-                validation_error_msg += f"Columns are missing in test dataframe."
+            # The schema checks only need the columns: read just the header of each file
+            train_df, test_df = (DataValidation.read_header(file_path=self.data_ingestion_artifact.trained_file_path),
+                                 DataValidation.read_header(file_path=self.data_ingestion_artifact.test_file_path))
 
-            # Validate required columns for training dataframe
-            status = self.is_column_exist(df=train_df)
-            if not status:
-                validation_error_msg += f"Columns are missing in training dataframe."
-
-            # Validate required columns for testing dataframe
-            status = self.is_column_exist(df=test_df)
-            if not status:
-                validation_error_msg += f"columns are missing in test dataframe."
+            # Validate column count and required columns of each dataframe in one pass
+            train_status, train_error_msg = self._validate_schema(train_df, role="training")
+            test_status, test_error_msg = self._validate_schema(test_df, role="test")
+            validation_error_msg = " ".join(msg for msg in (train_error_msg, test_error_msg) if msg)
 
             # Determine overall validation status based on accumulated messages
             validation_status = len(validation_error_msg) == 0
 
             # If schema checks pass, proceed to drift detection
             if validation_status:
-                drift_status = self.detect_dataset_drift(train_df, test_df)
+                drift_cache_path = self.get_drift_cache_path()
+                if os.path.exists(drift_cache_path):
+                    # Same train/test contents as a previous run: the cached report is reused
+                    # and the datasets do not need to be loaded at all
+                    train_df, test_df = None, None
+                else:
+                    # Only now load the full datasets, parsed in bounded-size chunks; the two
+                    # files are independent, so they are read concurrently
+                    chunksize = self.data_validation_config.read_chunksize
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        # Only the drift feature columns are loaded
+                        train_future = executor.submit(self.read_data, self.data_ingestion_artifact.trained_file_path,
+                                                       chunksize, self._feature_columns,
+                                                       self.data_ingestion_artifact.train_table)
+                        test_future = executor.submit(self.read_data, self.data_ingestion_artifact.test_file_path,
+                                                      chunksize, self._feature_columns,
+                                                      self.data_ingestion_artifact.test_table)
+                        train_df, test_df = train_future.result(), test_future.result()
+                drift_status = self.detect_dataset_drift(train_df, test_df, cache_file_path=drift_cache_path)
                 if drift_status:
                     logging.info(f"Drift detected.")
                     validation_error_msg = "Drift detected"
@@ -331,6 +444,11 @@ class DataValidation:
             else:
                 logging.info(f"Validation_error: {validation_error_msg}")
 
+            # The artifact points at the drift report: make sure its write has completed
+            # (re-raising any write error)
+            if self._write_future is not None:
+                self._write_future.result()
+
             # Build the DataValidationArtifact with status, message, and drift report path
             data_validation_artifact = DataValidationArtifact(
                 validation_status=validation_status,
@@ -13,17 +13,26 @@ from AIML_1013_Project1.entity.config_entity import ModelEvaluationConfig
 from AIML_1013_Project1.entity.artifact_entity import ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact
 from sklearn.metrics import f1_score
 from AIML_1013_Project1.exceptions import custom_exception
-from AIML_1013_Project1.constants import TARGET_COLUMN
+from AIML_1013_Project1.constants import TARGET_COLUMN, SCHEMA_FILE_PATH
+from AIML_1013_Project1.utils import (read_yaml_file, apply_schema_dtypes, file_digest,
+                                     save_numpy_array_data, load_numpy_array_data, get_parquet_sibling)
 from AIML_1013_Project1.logger import logging
+import os
 import sys
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
 from AIML_1013_Project1.entity.s3_estimator import project1Estimator
 from dataclasses import dataclass
+from functools import cached_property
 from AIML_1013_Project1.entity.estimator import project1Model
 from AIML_1013_Project1.entity.estimator import TargetValueMapping
 
 
+# Label -> code lookup, built once at import.
+_TARGET_MAP = TargetValueMapping()._asdict()
+
+
 @dataclass
 class EvaluateModelResponse:
     """
@@ -38,7 +47,8 @@ class EvaluateModelResponse:
     is_model_accepted : bool
         True if the trained model's F1 score strictly exceeds the production model's F1 score (or 0 if none).
     difference : float
-        trained_model_f1_score - (best_model_f1_score or 0). Positive implies an improvement.
+        trained_model_f1_score - (best_model_f1_score or 0), or trained_model_f1_score - min_acceptable_f1
+        when the opt-in floor rejects the model. Positive implies an improvement.
     """
     trained_model_f1_score: float
     best_model_f1_score: float
@@ -71,13 +81,24 @@ class ModelEvaluation:
             self.model_eval_config = model_eval_config      # Store evaluation configuration (e.g., S3 info).
             self.data_ingestion_artifact = data_ingestion_artifact  # Access to test data path.
             self.model_trainer_artifact = model_trainer_artifact    # Access to trained model metrics/paths.
+            self.best_model_etag: Optional[str] = None              # S3 ETag of the production model, if any.
+            self._prediction_cache: dict = {}                       # (etag, test digest) -> predictions.
+            self._test_data = None                                  # (features, int8 target), read once.
         except Exception as e:
             raise custom_exception(e, sys) from e
 
-    def get_best_model(self) -> Optional[project1Estimator]:
+    @cached_property
+    def best_model(self) -> Optional[project1Estimator]:
         """
         Retrieve a handle to the current production model stored in S3, if present.
 
+        Resolved once per ModelEvaluation instance: repeated evaluations (retries,
+        step replays) reuse the estimator, its S3 client and any model it has loaded,
+        without another HEAD request.
+
+        A single HEAD request checks for the model and records its ETag in
+        `self.best_model_etag`, which identifies the model version for the prediction cache.
+
         Returns
         -------
         Optional[TelcoEstimator]
@@ -94,23 +115,111 @@ class ModelEvaluation:
             project1_estimator = project1Estimator(bucket_name=bucket_name,
                                              model_path=model_path)   # Initialize estimator wrapper for S3 model.
 
-            if project1_estimator.is_model_present(model_path=model_path):  # Check model presence at specified path.
+            self.best_model_etag = project1_estimator.get_model_etag()  # None if no model at the path.
+            if self.best_model_etag is not None:
                 return project1_estimator
             return None                                                 # No production model available.
         except Exception as e:
             raise custom_exception(e, sys)
 
+    def get_best_model(self) -> Optional[project1Estimator]:
+        """Return the cached production model handle (see `best_model`)."""
+        return self.best_model
+
+    def get_best_model_predictions(self, best_model: project1Estimator, x: pd.DataFrame) -> np.ndarray:
+        """
+        Predict the test set with the production model, reusing earlier predictions when possible.
+
+        Predictions are cached in memory and on disk under
+        `model_eval_config.prediction_cache_dir`, keyed by the production model's S3 ETag
+        and the digest of the test file. The same model scored on the same test file is
+        therefore never downloaded or run again.
+
+        Parameters
+        ----------
+        best_model : TelcoEstimator
+            Handle to the production model returned by `get_best_model`.
+        x : pandas.DataFrame
+            Test features.
+
+        Returns
+        -------
+        np.ndarray
+            Production model predictions for `x`.
+        """
+        cache_key = (self.best_model_etag, file_digest(self.data_ingestion_artifact.test_file_path))
+        if cache_key in self._prediction_cache:
+            return self._prediction_cache[cache_key]
+
+        cache_file_path = os.path.join(self.model_eval_config.prediction_cache_dir, "_".join(cache_key) + ".npy")
+        if os.path.exists(cache_file_path):
+            logging.info(f"Reusing cached production model predictions: {cache_file_path}")
+            y_hat = load_numpy_array_data(file_path=cache_file_path)
+        else:
+            y_hat = np.asarray(best_model.predict(x))
+            save_numpy_array_data(cache_file_path, array=y_hat)
+
+        self._prediction_cache[cache_key] = y_hat
+        return y_hat
+
+    def load_test_data(self) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Read the held-out test set once and return its features and int8-encoded target.
+
+        Only the columns the preprocessor consumes, plus the target, are loaded: from the
+        Arrow table handed over by ingestion in the same process, else from the Parquet copy
+        written by ingestion when present (otherwise the CSV).
+        """
+        if self._test_data is None:
+            schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            usecols = (schema_config["oh_columns"] + schema_config["or_columns"]
+                       + schema_config["transform_columns"] + [TARGET_COLUMN])
+            test_file_path = self.data_ingestion_artifact.test_file_path
+            parquet_path = get_parquet_sibling(test_file_path)                  # Parquet copy from ingestion.
+            test_table = self.data_ingestion_artifact.test_table
+            if test_table is not None:
+                raw_df = test_table.select(usecols).to_pandas()                  # Already in memory.
+            elif os.path.exists(parquet_path):
+                raw_df = pd.read_parquet(parquet_path, engine="pyarrow",         # Column-pruned, mmap'd read;
+                                         columns=usecols, memory_map=True)      # no CSV parsing at all.
+            else:
+                raw_df = pd.read_csv(test_file_path, usecols=usecols,            # Fallback: parse the CSV
+                                     engine="c", memory_map=True, low_memory=False)  # from an mmap.
+            test_df = apply_schema_dtypes(raw_df, schema_config)                  # Compact dtypes.
+
+            x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]   # Separate features/target.
+            self._test_data = (x, y.map(_TARGET_MAP).to_numpy(dtype=np.int8))     # Labels as an int8 array.
+        return self._test_data
+
+    def prefetch_best_model_predictions(self) -> None:
+        """
+        Resolve the production model and score the test set with it ahead of `evaluate_model`.
+
+        Needs neither the trained model nor its metrics, so the pipeline runs it while the
+        candidate is still being trained; `evaluate_model` then finds the predictions cached.
+        """
+        try:
+            best_model = self.best_model
+            if best_model is not None:
+                x, _ = self.load_test_data()
+                self.get_best_model_predictions(best_model, x)
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
     def evaluate_model(self) -> EvaluateModelResponse:
         """
         Evaluate the newly trained model and (if available) the production model on the same test set.
 
         Workflow
         --------
+        0) If `min_acceptable_f1` is set and the trained model's F1 score does not exceed it,
+           reject it right away without touching S3 or the test data. Unset (the default),
+           a first deployment is accepted as before.
         1) Load test data from DataIngestionArtifact.
         2) Split into features X and target y using TARGET_COLUMN.
         3) Map human-readable target labels to numeric codes via TargetValueMapping()._asdict().
         4) Obtain the trained model's F1 score from ModelTrainerArtifact.metric_artifact.
-        5) If a production model exists in S3, compute its predictions and F1 score.
+        5) If a production model exists in S3, compute (or reuse cached) predictions and its F1 score.
         6) Compare scores and compute acceptance decision and difference.
 
         Returns
@@ -124,21 +233,27 @@ class ModelEvaluation:
             If any step fails (I/O errors, metric computation, etc.).
         """
         try:
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)   # Load held-out test dataset.
-
-            x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]   # Separate features/target.
-            y = y.replace(
-                TargetValueMapping()._asdict()                                   # Map string labels to ints.
-            )
-
             # trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
             trained_model_f1_score = self.model_trainer_artifact.metric_artifact.f1_score  # Use stored metric.
 
+            # Short-circuit (opt-in): a model below the floor is rejected whatever production scores.
+            min_acceptable_f1 = self.model_eval_config.min_acceptable_f1
+            if min_acceptable_f1 is not None and trained_model_f1_score <= min_acceptable_f1:
+                result = EvaluateModelResponse(trained_model_f1_score=trained_model_f1_score,
+                                               best_model_f1_score=None,
+                                               is_model_accepted=False,
+                                               difference=trained_model_f1_score - min_acceptable_f1)  # <= 0, as for any rejection.
+                logging.info(f"Trained model F1 is not above the minimum acceptable score. Result: {result}")
+                return result
+
+            x, y = self.load_test_data()                                          # Test features, int8 target.
+
             best_model_f1_score = None
-            best_model = self.get_best_model()                                    # Attempt to fetch prod model.
+            best_model = self.best_model                                          # Cached prod model handle.
             if best_model is not None:
-                y_hat_best_model = best_model.predict(x)                          # Predict with prod model.
-                best_model_f1_score = f1_score(y, y_hat_best_model)               # Compute prod F1 on test set.
+                y_hat_best_model = self.get_best_model_predictions(best_model, x)  # Predict with prod model.
+                best_model_f1_score = f1_score(y, y_hat_best_model, pos_label=1,  # Compute prod F1 on test set
+                                               zero_division=0)                   # (0, not a warning, if no positives).
             
             tmp_best_model_score = 0 if best_model_f1_score is None else best_model_f1_score  # Baseline for compare.
             result = EvaluateModelResponse(trained_model_f1_score=trained_model_f1_score,
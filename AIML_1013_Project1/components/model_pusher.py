@@ -8,7 +8,11 @@ Purpose:
 """
 
 import sys
+from functools import cached_property
+from boto3.s3.transfer import TransferConfig
 from AIML_1013_Project1.cloud_storage.aws_storage import SimpleStorageService
+from AIML_1013_Project1.constants import (MODEL_PUSHER_MULTIPART_THRESHOLD, MODEL_PUSHER_MULTIPART_CHUNKSIZE,
+                                         MODEL_PUSHER_MAX_CONCURRENCY, MODEL_PUSHER_GZIP_LEVEL)
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 from AIML_1013_Project1.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
@@ -31,17 +35,28 @@ class ModelPusher:
 
         Notes
         -----
-        - The SimpleStorageService instance (`self.s3`) is available if direct AWS operations
-          are needed in future extensions, though not currently used.
+        - A SimpleStorageService instance (`self.s3`) is available if direct AWS operations
+          are needed in future extensions; it is only created on first access.
         - `telco_estimator` wraps the logic for saving/loading models to/from S3.
+        - `_transfer_config` uploads large models in 64 MiB parts, 16 at a time.
         """
-        self.s3 = SimpleStorageService()
         self.model_evaluation_artifact = model_evaluation_artifact
         self.model_pusher_config = model_pusher_config
         self.telco_estimator = project1Estimator(
             bucket_name=model_pusher_config.bucket_name,
             model_path=model_pusher_config.s3_model_key_path
         )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MODEL_PUSHER_MULTIPART_THRESHOLD,
+            multipart_chunksize=MODEL_PUSHER_MULTIPART_CHUNKSIZE,
+            max_concurrency=MODEL_PUSHER_MAX_CONCURRENCY,
+            use_threads=True,
+        )
+
+    @cached_property
+    def s3(self) -> SimpleStorageService:
+        """Storage service for direct S3 operations, created lazily on first use."""
+        return SimpleStorageService()
 
     def initiate_model_pusher(self) -> ModelPusherArtifact:
         """
@@ -75,8 +90,13 @@ class ModelPusher:
         try:
             logging.info("Starting upload of the trained model file to the S3 bucket")
 
-            # Upload the trained model from local path to S3 using the TelcoEstimator interface.
-            self.telco_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
+            # Upload the trained model from local path to S3 using the TelcoEstimator interface
+            # (gzip level 1 shrinks pickled models several-fold for little CPU).
+            self.telco_estimator.save_model(
+                from_file=self.model_evaluation_artifact.trained_model_path,
+                transfer_config=self._transfer_config,
+                gzip_level=MODEL_PUSHER_GZIP_LEVEL,
+            )
 
             # Construct the artifact summarizing the model push.
             model_pusher_artifact = ModelPusherArtifact(
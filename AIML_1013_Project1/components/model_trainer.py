@@ -8,16 +8,19 @@ Purpose:
     path and the test-set metrics.
 """
 
+import os
 import sys
-from typing import Tuple
+import json
+import hashlib
+import importlib
+from typing import Optional, Tuple
 
 import numpy as np
-from sklearn.metrics import f1_score, precision_score, recall_score
-from neuro_mf import ModelFactory
+from neuro_mf import ModelFactory, BestModel
 
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
-from AIML_1013_Project1.utils import load_numpy_array_data, load_object, save_object
+from AIML_1013_Project1.utils import load_numpy_array_data, load_object, save_object, _to_builtin
 from AIML_1013_Project1.entity.config_entity import ModelTrainerConfig
 from AIML_1013_Project1.entity.artifact_entity import (
     DataTransformationArtifact,
@@ -27,6 +30,11 @@ from AIML_1013_Project1.entity.artifact_entity import (
 from AIML_1013_Project1.entity.estimator import project1Model
 
 
+def _plain_params(params: dict) -> dict:
+    # NumPy scalars/arrays as plain Python values; anything else is left for json to accept or reject
+    return {k: _to_builtin(v) if isinstance(v, (np.generic, np.ndarray)) else v for k, v in params.items()}
+
+
 class ModelTrainer:
     def __init__(self, data_transformation_artifact: DataTransformationArtifact,
                  model_trainer_config: ModelTrainerConfig):
@@ -44,6 +52,58 @@ class ModelTrainer:
         self.data_transformation_artifact = data_transformation_artifact
         self.model_trainer_config = model_trainer_config
 
+    def get_search_cache_path(self, train: np.ndarray) -> str:
+        """
+        Location of the cached model search result for this model config, expected
+        accuracy and training array (a hash of all three).
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.model_trainer_config.model_config_file_path, "rb") as config_file:
+            digest.update(config_file.read())
+        digest.update(repr((self.model_trainer_config.expected_accuracy, train.shape, train.dtype.str)).encode())
+        # Hash the array's memory as laid out (F-ordered arrays through their C-ordered transpose)
+        digest.update(train.T if train.flags.f_contiguous else np.ascontiguousarray(train))
+        return os.path.join(self.model_trainer_config.search_cache_dir, digest.hexdigest() + ".json")
+
+    @staticmethod
+    def load_cached_best_model(cache_file_path: str, x_train: np.ndarray, y_train: np.ndarray) -> Optional[BestModel]:
+        """
+        Refit the estimator recorded by an earlier model search on the same inputs, skipping
+        the search. Returns None if nothing is cached.
+        """
+        if not os.path.exists(cache_file_path):
+            return None
+        with open(cache_file_path) as cache_file:
+            record = json.load(cache_file)
+        model_class = getattr(importlib.import_module(record["module"]), record["class"])
+        best_model = model_class(**record["params"]).fit(x_train, y_train)
+        logging.info(f"Reusing cached model search result: {cache_file_path}")
+        return BestModel(model_serial_number=record["model_serial_number"], model=None, best_model=best_model,
+                         best_parameters=record["best_parameters"], best_score=record["best_score"])
+
+    @staticmethod
+    def save_best_model_search(cache_file_path: str, best_model_detail: BestModel) -> None:
+        """
+        Record the estimator class and parameters chosen by a model search. Models whose
+        parameters are not plain JSON values (e.g. nested estimators) are not cached.
+        """
+        model_obj = best_model_detail.best_model
+        try:
+            record = json.dumps({
+                "module": type(model_obj).__module__,
+                "class": type(model_obj).__name__,
+                "params": _plain_params(model_obj.get_params(deep=False)),
+                "model_serial_number": best_model_detail.model_serial_number,
+                "best_parameters": _plain_params(best_model_detail.best_parameters),
+                "best_score": float(best_model_detail.best_score),
+            })
+        except TypeError:
+            logging.info("Model search result is not JSON serializable, not caching it")
+            return
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+        with open(cache_file_path, "w") as cache_file:
+            cache_file.write(record)
+
     def get_model_object_and_report(self, train: np.ndarray, test: np.ndarray) -> Tuple[object, object]:
         """
         Method Name :   get_model_object_and_report
@@ -54,11 +114,13 @@ class ModelTrainer:
 
         Detailed behavior
         -----------------
-        - Initializes a ModelFactory with the provided YAML model config.
         - Splits the provided numpy arrays into (X, y) for train and test.
-        - Calls `get_best_model` with a base accuracy threshold.
+        - If the same model config, expected accuracy and training array were searched before,
+          refits the recorded best estimator instead of searching again.
+        - Otherwise initializes a ModelFactory with the provided YAML model config, calls
+          `get_best_model` with a base accuracy threshold and records the result.
         - Uses the selected best model to predict on X_test.
-        - Computes F1, precision, and recall with explicit binary settings (pos_label=1).
+        - Computes F1, precision, and recall (positive label 1) from one pass of TP/FP/FN counts.
         - Returns the best model detail (from ModelFactory) and the metrics artifact.
 
         Parameters
@@ -77,21 +139,43 @@ class ModelTrainer:
             - metric_artifact: DataClassificationMetricArtifact with f1, precision, and recall
         """
         try:
-            logging.info("Using neuro_mf to get best model object and report")
-            model_factory = ModelFactory(model_config_path=self.model_trainer_config.model_config_file_path)
-            
-            x_train, y_train, x_test, y_test = train[:, :-1], train[:, -1], test[:, :-1], test[:, -1]
-
-            best_model_detail = model_factory.get_best_model(
-                X=x_train, y=y_train, base_accuracy=self.model_trainer_config.expected_accuracy
-            )
+            # Feature blocks are views into the (memory-mapped, F-ordered) arrays, so the column
+            # slice stays contiguous; only the small target columns are copied, as int8 labels.
+            x_train, y_train = train[:, :-1], train[:, -1].astype(np.int8, copy=False)
+            x_test, y_test = test[:, :-1], test[:, -1].astype(np.int8, copy=False)
+
+            # The search outcome depends only on the config and the training data: reuse it when both match.
+            cache_file_path = self.get_search_cache_path(train)
+            best_model_detail = self.load_cached_best_model(cache_file_path, x_train, y_train)
+            if best_model_detail is None:
+                logging.info("Using neuro_mf to get best model object and report")
+                model_factory = ModelFactory(model_config_path=self.model_trainer_config.model_config_file_path)
+                best_model_detail = model_factory.get_best_model(
+                    X=x_train, y=y_train, base_accuracy=self.model_trainer_config.expected_accuracy
+                )
+                self.save_best_model_search(cache_file_path, best_model_detail)
             model_obj = best_model_detail.best_model  # Selected estimator from the model factory.
 
-            y_pred = model_obj.predict(x_test)  # Predictions on the test features.
-            
-            f1 = f1_score(y_test, y_pred, pos_label=1)
-            precision = precision_score(y_test, y_pred, pos_label=1)
-            recall = recall_score(y_test, y_pred, pos_label=1)
+            # Predictions on the test features. Probabilistic classifiers are run once through
+            # predict_proba and labelled by argmax, as their predict does internally; `proba`
+            # stays available for probability-based metrics without a second pass.
+            if hasattr(model_obj, "predict_proba"):
+                proba = model_obj.predict_proba(x_test)
+                y_pred = model_obj.classes_.take(proba.argmax(axis=1))
+            else:
+                y_pred = model_obj.predict(x_test)
+
+            # Binary confusion counts; metrics are 0 where undefined (no positives). The 0/1 int8
+            # targets are reinterpreted as booleans without a copy, and only one N-sized
+            # intermediate (yt & yp) is built: fp and fn follow from the positive counts.
+            yt = y_test.view(np.bool_)
+            yp = np.asarray(y_pred) == 1
+            tp = int(np.count_nonzero(yt & yp))
+            fp = int(np.count_nonzero(yp)) - tp
+            fn = int(np.count_nonzero(yt)) - tp
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
             metric_artifact = DataClassificationMetricArtifact(
                 f1_score=f1, precision_score=precision, recall_score=recall
             )
@@ -112,7 +196,7 @@ class ModelTrainer:
 
         Detailed behavior
         -----------------
-        - Loads transformed train/test arrays from disk.
+        - Takes the transformed train/test arrays from the artifact if present, otherwise loads them from disk.
         - Calls `get_model_object_and_report` to select the best model and compute metrics.
         - Loads the fitted preprocessing object.
         - Checks that the best model score meets the expected accuracy threshold.
@@ -122,12 +206,22 @@ class ModelTrainer:
         """
         logging.info("Entered initiate_model_trainer method of ModelTrainer class")
         try:
-            train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_train_file_path)
-            test_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_test_file_path)
+            artifact = self.data_transformation_artifact
+            if artifact.train_array is not None and artifact.test_array is not None:
+                # Same process as the transformation: use its arrays, no read back from disk.
+                train_arr = artifact.train_array.astype(np.float32, copy=False)
+                test_arr = artifact.test_array.astype(np.float32, copy=False)
+            else:
+                # Memory-map the transformed arrays instead of reading them into fresh buffers; they are
+                # used as float32 (a no-op for arrays the transformation already saved as float32).
+                train_arr = load_numpy_array_data(file_path=artifact.transformed_train_file_path,
+                                                  mmap_mode="r", dtype=np.float32)
+                test_arr = load_numpy_array_data(file_path=artifact.transformed_test_file_path,
+                                                 mmap_mode="r", dtype=np.float32)
             
             best_model_detail, metric_artifact = self.get_model_object_and_report(train=train_arr, test=test_arr)
             
-            preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
+            preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path, mmap_mode="r")
 
             # Guardrail: ensure the selected model meets or exceeds the expected baseline.
             if best_model_detail.best_score < self.model_trainer_config.expected_accuracy:
@@ -148,7 +242,7 @@ class ModelTrainer:
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 metric_artifact=metric_artifact,
             )
-            logging.info(f"Model trainer artifact: {model_trainer_artifact}")
+            logging.info("Model trainer artifact: %s", model_trainer_artifact)
             return model_trainer_artifact
         except Exception as e:
             raise custom_exception(e, sys) from e
\ No newline at end of file
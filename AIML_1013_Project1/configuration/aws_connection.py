@@ -8,7 +8,7 @@ create both a client and a resource interface for interacting with S3 buckets.
 Responsibilities
 ----------------
 - Retrieve AWS credentials (Access Key ID and Secret Access Key) from environment variables.
-- Initialize a global `boto3` S3 client and resource if they are not already set.
+- Create one `boto3` session, S3 client and S3 resource per region and process, on first use.
 - Provide these handles to subclasses or other components that require S3 access.
 
 Notes
@@ -16,11 +16,56 @@ Notes
 - The credentials are fetched from environment variables defined in the project constants.
 - This design ensures that S3 connection objects (`s3_client` and `s3_resource`)
   are shared across all instances of the class to minimize repeated connection overhead.
+  They are built by the cached `_boto3_clients` factory under a lock, so threads that
+  construct `S3Client` concurrently never create duplicate sessions.
+- The HTTP connection pool is sized by `S3_MAX_POOL_CONNECTIONS` so that concurrent
+  transfers issued from worker threads reuse connections instead of opening new ones.
+- Requests are retried in botocore's adaptive mode (exponential backoff plus client-side
+  rate limiting), so throttling and transient 5xx errors do not fail the pipeline.
 """
 
 import boto3
 import os
-from AIML_1013_Project1.constants import AWS_SECRET_ACCESS_KEY, AWS_ACCESS_KEY_ID_ENV, REGION_NAME
+import threading
+from functools import lru_cache
+from botocore.config import Config
+from AIML_1013_Project1.constants import AWS_SECRET_ACCESS_KEY, AWS_ACCESS_KEY_ID_ENV, REGION_NAME, S3_MAX_POOL_CONNECTIONS, S3_MAX_RETRY_ATTEMPTS
+
+
+# Size the connection pool for concurrent transfers from worker threads and
+# absorb throttling / transient errors with adaptive retries
+_S3_CONFIG = Config(
+    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+    retries={"max_attempts": S3_MAX_RETRY_ATTEMPTS, "mode": "adaptive"}
+)
+
+# lru_cache alone may run the factory twice when two threads miss at once
+_CLIENTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _boto3_clients(region_name):
+    """
+    Create the S3 client and resource for `region_name` from one boto3 session.
+
+    Cached, so each region's session is built once per process.
+    """
+    # Fetch AWS credentials from environment variables
+    access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV,)
+    secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY,)
+
+    # Validate that required environment variables are set
+    if access_key_id is None:
+        raise Exception(f"Environment variable: {AWS_ACCESS_KEY_ID_ENV} is not not set.")
+    if secret_access_key is None:
+        raise Exception(f"Environment variable: {AWS_SECRET_ACCESS_KEY} is not set.")
+
+    session = boto3.session.Session(
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        region_name=region_name,
+    )
+    return session.client('s3', config=_S3_CONFIG), session.resource('s3', config=_S3_CONFIG)
 
 
 class S3Client:
@@ -30,9 +75,9 @@ class S3Client:
     Attributes
     ----------
     s3_client : boto3.client
-        Class-level reference to the S3 client, initialized once per runtime.
+        S3 client, shared by every instance for the same region.
     s3_resource : boto3.resource
-        Class-level reference to the S3 resource, initialized once per runtime.
+        S3 resource, shared by every instance for the same region.
 
     Methods
     -------
@@ -40,21 +85,16 @@ class S3Client:
         Initializes the S3 client and resource using environment-based AWS credentials.
     """
 
-    # Class-level (shared) attributes to ensure single S3 session across instances.
-    s3_client = None
-    s3_resource = None
-
     def __init__(self, region_name=REGION_NAME):
         """
         Initialize the S3 client and resource.
 
         Description
         -----------
-        This constructor retrieves AWS credentials from environment variables defined in
-        the project constants (`AWS_ACCESS_KEY_ID_ENV` and `AWS_SECRET_ACCESS_KEY`).
-        If credentials are missing, an exception is raised.
-        When valid credentials are found, it creates and stores the boto3 S3 client and
-        resource objects at the class level so that subsequent instances reuse them.
+        The client and resource come from `_boto3_clients`, which reads AWS credentials
+        from environment variables defined in the project constants (`AWS_ACCESS_KEY_ID_ENV`
+        and `AWS_SECRET_ACCESS_KEY`) and builds them once per region. If credentials are
+        missing, an exception is raised.
 
         Parameters
         ----------
@@ -66,36 +106,5 @@ class S3Client:
         Exception
             If AWS access key ID or secret access key environment variables are not set.
         """
-
-        # Only initialize S3 connections once for the entire class
-        if S3Client.s3_resource == None or S3Client.s3_client == None:
-
-            # Fetch AWS credentials from environment variables
-            __access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV,)
-            __secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY,)
-
-            # Validate that required environment variables are set
-            if __access_key_id is None:
-                raise Exception(f"Environment variable: {AWS_ACCESS_KEY_ID_ENV} is not not set.")
-            if __secret_access_key is None:
-                raise Exception(f"Environment variable: {AWS_SECRET_ACCESS_KEY} is not set.")
-
-            # Create a new boto3 S3 resource interface
-            S3Client.s3_resource = boto3.resource(
-                's3',
-                aws_access_key_id=__access_key_id,
-                aws_secret_access_key=__secret_access_key,
-                region_name=region_name
-            )
-
-            # Create a new boto3 S3 client interface
-            S3Client.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=__access_key_id,
-                aws_secret_access_key=__secret_access_key,
-                region_name=region_name
-            )
-
-        # Assign class-level client/resource to the instance
-        self.s3_resource = S3Client.s3_resource
-        self.s3_client = S3Client.s3_client
\ No newline at end of file
+        with _CLIENTS_LOCK:
+            self.s3_client, self.s3_resource = _boto3_clients(region_name)
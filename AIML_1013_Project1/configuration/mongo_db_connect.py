@@ -1,11 +1,12 @@
 import sys 
 import os 
 import pymongo
+from pymongo.server_api import ServerApi
 
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 
-from AIML_1013_Project1.constants import DATABASE_NAME, MONGODBURL
+from AIML_1013_Project1.constants import DATABASE_NAME, MONGODBURL, MONGO_MAX_POOL_SIZE, MONGO_COMPRESSORS
 
 class MongoDBClient:
 
@@ -17,13 +18,20 @@ class MongoDBClient:
                 mongo_db_url = os.getenv(MONGODBURL)
                 if mongo_db_url is None:
                     raise Exception("MONGODBURL environment variable not set")
-                MongoDBClient.client = pymongo.MongoClient(mongo_db_url)
-                logging.info(f"MongoDB client created with URL: {mongo_db_url}")
+                # One pooled client per process; large find() responses are wire-compressed
+                MongoDBClient.client = pymongo.MongoClient(
+                    mongo_db_url,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    compressors=MONGO_COMPRESSORS,
+                    server_api=ServerApi("1"),
+                    uuidRepresentation="standard",
+                )
+                logging.info("MongoDB client created with URL: %s", mongo_db_url)
             self.client = MongoDBClient.client
             self.database = self.client[database_name]
             self.database_name = database_name
-            logging.info(f"Connected to database: {self.database_name}")
+            logging.info("Connected to database: %s", self.database_name)
         except Exception as e:
-            logging.error(f"Failed to connect to MongoDB: {e}")
+            logging.error("Failed to connect to MongoDB: %s", e)
             raise custom_exception(e, sys) from e
                   
\ No newline at end of file
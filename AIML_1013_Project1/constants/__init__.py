@@ -1,11 +1,15 @@
 import os 
 from datetime import date 
+from typing import Optional
 
 DATABASE_NAME = "AIMLcluster"
 
 COLLECTION_NAME = "churn_data"
 
 MONGODBURL = "MONGODB_URL"
+MONGO_MAX_POOL_SIZE: int = 100
+# Wire compression for mongo responses, in order of preference (zstd needs the zstandard package)
+MONGO_COMPRESSORS: str = "zstd,zlib"
 
 
 PIPELINE_NAME:str = "project1_churn_pipeline"
@@ -16,7 +20,7 @@ MODEL_FILE_NAME = "model.pkl"
 TARGET_COLUMN = "Churn"
 PREPOCESSING_OBJECT_FILE_NAME = "preprocessor.pkl"
 
-FILE_NAME: str = "project1_churn.csv"
+FILE_NAME: str = "project1_churn.parquet"
 TRAIN_FILE_NAME: str = "train.csv"
 TEST_FILE_NAME: str = "test.csv"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
@@ -24,6 +28,12 @@ SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 AWS_ACCESS_KEY_ID_ENV = 'AWS_ACCESS_KEY_ID'
 AWS_SECRET_ACCESS_KEY = 'AWS_SECRET_ACCESS_KEY'
 REGION_NAME = "us-east-2"
+S3_MAX_POOL_CONNECTIONS: int = 32
+S3_MAX_WORKERS: int = 16
+S3_MAX_RETRY_ATTEMPTS: int = 10
+S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+S3_TRANSFER_MAX_CONCURRENCY: int = 16
 
 
 """
@@ -34,6 +44,8 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
+DATA_INGESTION_BATCH_SIZE: int = 50_000
+DATA_INGESTION_RANDOM_STATE: int = 42
 
 
 """
@@ -42,6 +54,9 @@ Data Validation related constants with DATA_VALIDATION VAR NAME
 DATA_VALIDATION_DIR_NAME: str = "data_validation"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_READ_CHUNKSIZE: int = 100_000
+DATA_VALIDATION_MAX_DRIFT_ROWS: int = 50_000
+DATA_VALIDATION_DRIFT_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "drift_cache")
 
 
 """
@@ -60,13 +75,30 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_MODEL_CONFIG_FILE_PATH: str = os.path.join("config", "model.yaml")
+MODEL_TRAINER_SEARCH_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "model_search_cache")
 
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
+# Opt-in hard floor on the trained model's F1; None keeps the plain comparison with production
+MODEL_EVALUATION_MIN_ACCEPTABLE_F1: Optional[float] = None
+MODEL_EVALUATION_PREDICTION_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "prediction_cache")
 MODEL_BUCKET_NAME = "aiml1013project1"
 MODEL_PUSHER_S3_KEY = "model-registry"
+MODEL_PUSHER_MULTIPART_THRESHOLD: int = 16 * 1024 * 1024
+MODEL_PUSHER_MULTIPART_CHUNKSIZE: int = 64 * 1024 * 1024
+MODEL_PUSHER_MAX_CONCURRENCY: int = 16
+MODEL_PUSHER_GZIP_LEVEL: int = 1
 
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 8080
+# One uvicorn worker process per CPU when app.py is run directly
+APP_WORKERS: int = os.cpu_count() or 1
+# Concurrent predict requests are coalesced into one model call of up to this many rows,
+# waiting at most this many seconds for the batch to fill
+PREDICTION_MAX_BATCH_SIZE: int = 32
+PREDICTION_MAX_LATENCY: float = 0.010
+# Seconds a loaded model is served before its S3 ETag is checked again, so a model pushed
+# by another process (e.g. another worker's /train) is picked up within this long
+MODEL_CACHE_TTL: float = 60.0
 
  # Attempting to update 01
\ No newline at end of file
@@ -1,12 +1,35 @@
 from AIML_1013_Project1.configuration.mongo_db_connect import MongoDBClient
-from AIML_1013_Project1.constants import DATABASE_NAME
+from AIML_1013_Project1.constants import DATABASE_NAME, SCHEMA_FILE_PATH
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
+from AIML_1013_Project1.utils import read_yaml_file
 
+import numpy as np
 import pandas as pd
 import sys 
-from typing import Optional 
-import numpy as np
+from itertools import islice
+from typing import Iterator, Optional 
+
+# Server-side projection leaving out mongo's `_id` ObjectIds
+_NO_ID_PROJECTION = {"_id": 0}
+# String values stored in the collection in place of missing values
+_NA_MARKERS = ["na"]
+
+
+def _to_float(value) -> float:
+    # Numbers pass through, numeric strings are parsed, anything else ("na", " ", None) is NaN
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _empty_column(n_rows: int, dtype) -> np.ndarray:
+    # Unfilled cells read as missing, like fields absent from a document
+    return np.full(n_rows, np.nan, dtype=dtype)
+
 
 class project1Data:
 
@@ -18,30 +41,70 @@ class project1Data:
         except Exception as e:
             raise custom_exception(e, sys)
     
-    def export_collection_as_dataframe(self, collection_name: str, database_name: Optional[str]) -> pd.DataFrame:
-
-        try:
-            logging.info(f'Exporting data from collection: {collection_name}')
+    def _get_collection(self, collection_name: str, database_name: Optional[str]):
+        if database_name is None:
+            return self.mongo_client.database[collection_name]
+        return self.mongo_client.client[database_name][collection_name]
 
-            if database_name is None:
-                collection = self.mongo_client.database[collection_name]
-            else: 
-                collection = self.mongo_client.client[database_name][collection_name]
+    @staticmethod
+    def _prepare_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        # Only string columns can hold the "na" marker; numeric columns are not scanned
+        obj_cols = df.select_dtypes(include="object").columns
+        if len(obj_cols):
+            df[obj_cols] = df[obj_cols].mask(df[obj_cols].isin(_NA_MARKERS))
+        return df
 
-            data = list(collection.find())
-            logging.info(f"Number of records extracted: {len(data)}")
+    def iter_collection_batches(self, collection_name: str, database_name: Optional[str] = None,
+                                batch_size: int = 50_000) -> Iterator[pd.DataFrame]:
 
-            df = pd.DataFrame(data)
+        try:
+            logging.info('Streaming data from collection: %s in batches of %s', collection_name, batch_size)
+            collection = self._get_collection(collection_name, database_name)
 
-            if df.empty:
-                logging.warning("No data found in the collection. {collection_name} is empty.")
-                return df
-            if "_id" in df.columns:
-                df = df.drop(columns=["_id"], axis=1)
-                logging.info("Dropped the _id column from the DataFrame.")
+            # Only `batch_size` documents are held in Python memory at any time
+            # (`_id` is projected out on the server)
+            cursor = collection.find({}, projection=_NO_ID_PROJECTION, batch_size=batch_size)
+            numeric_columns = self._schema_numeric_columns()
+            n_batches = 0
+            while True:
+                # Columns are filled while draining the batch, never as a list of documents
+                columns = self._records_to_columns(islice(cursor, batch_size), batch_size, numeric_columns)
+                if not columns:
+                    break
+                n_batches += 1
+                yield self._prepare_dataframe(pd.DataFrame(columns, copy=False))
 
-            df.replace({"na": np.nan}, inplace=True)
-            logging.info(f"Dataframe shape after processing {df.shape}")
-            return df
+            logging.info("Number of batches extracted: %s", n_batches)
         except Exception as e:
             raise custom_exception(e, sys)
+
+    @staticmethod
+    def _schema_numeric_columns() -> set:
+        # Fields the schema types as "int" or "float"
+        schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+        return {column for column_types in schema_config["columns"]
+                for column, column_type in column_types.items() if column_type in ("int", "float")}
+
+    @staticmethod
+    def _records_to_columns(cursor, capacity: int, numeric_columns: set) -> dict:
+        """
+        Fill one array per field while iterating the cursor: float64 for the schema's numeric
+        fields (no per-cell type inference or boxing in the DataFrame constructor), object for
+        the rest. Arrays start at `capacity` rows and double when the estimate is exceeded.
+        """
+        columns = {}
+        n_rows = 0
+        for doc in cursor:
+            if n_rows == capacity:
+                capacity = max(2 * capacity, 1)
+                for name, arr in columns.items():
+                    grown = _empty_column(capacity, arr.dtype)
+                    grown[:n_rows] = arr[:n_rows]
+                    columns[name] = grown
+            for key, value in doc.items():
+                arr = columns.get(key)
+                if arr is None:
+                    arr = columns[key] = _empty_column(capacity, np.float64 if key in numeric_columns else object)
+                arr[n_rows] = _to_float(value) if arr.dtype.kind == "f" else value
+            n_rows += 1
+        return {name: arr[:n_rows] for name, arr in columns.items()}
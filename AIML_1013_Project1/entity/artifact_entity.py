@@ -1,48 +1,57 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
-@dataclass
+import numpy as np
+import pyarrow as pa
+
+@dataclass(slots=True, frozen=True)
 class DataIngestionArtifact: 
     trained_file_path: str
     test_file_path: str
+    # The same splits still in memory as Arrow tables, handed over when the next stages run
+    # in the same process
+    train_table: Optional[pa.Table] = field(default=None, repr=False, compare=False)
+    test_table: Optional[pa.Table] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataValidationArtifact: 
     validation_status: bool
     message: str
-    drift_report_path: str
+    drift_report_file_path: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataTransformationArtifact: 
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    # The same arrays still in memory, handed over when the trainer runs in the same process
+    train_array: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    test_array: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataClassificationMetricArtifact: 
     f1_score: float 
-    prediction_score: float 
-    rmse_score: float 
+    precision_score: float 
     recall_score: float 
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelTrainerArtifact:
     trained_model_file_path: str
     metric_artifact: DataClassificationMetricArtifact 
     
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelEvaluationArtifact:
     is_model_accepted: bool
     changed_accuracy: float 
-    changed_rmse: float
     s3_model_path: str
     trained_model_path: str  
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelPusherArtifact:
     bucket_name: str
     s3_model_path: str   
@@ -2,8 +2,9 @@ import os
 from AIML_1013_Project1.constants import *
 from dataclasses import dataclass 
 from datetime import datetime
+from typing import Optional
 
-TIMESTAMP = datetime.now().strftime("%m_%D_%Y_%H_%M_%S")
+TIMESTAMP = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
 
 
 @dataclass
@@ -24,18 +25,23 @@ class DataIngestionConfig:
     testing_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME)
     train_test_split_ratio: float = DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
     collection_name: str = DATA_INGESTION_COLLECTION_NAME
+    batch_size: int = DATA_INGESTION_BATCH_SIZE
+    random_state: int = DATA_INGESTION_RANDOM_STATE
 
 @dataclass
 class DataValidationConfig: 
     data_validation_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_VALIDATION_DIR_NAME)
     drift_report_file_path: str = os.path.join(data_validation_dir, DATA_VALIDATION_DRIFT_REPORT_DIR, DATA_VALIDATION_DRIFT_REPORT_FILE_NAME)
+    read_chunksize: int = DATA_VALIDATION_READ_CHUNKSIZE
+    max_drift_rows: int = DATA_VALIDATION_MAX_DRIFT_ROWS
+    drift_cache_dir: str = DATA_VALIDATION_DRIFT_CACHE_DIR
 
 
 @dataclass
 class DataTransformationConfig: 
     data_transformation_dir: str = os.path.join(training_pipeline_config.artifact_dir, DATA_TRANSFORMATION_DIR_NAME)
-    transformed_data_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-                                                   TRAIN_FILE_NAME.replace("csv", "npy"))
+    transformed_train_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                    TRAIN_FILE_NAME.replace("csv", "npy"))
     transformed_test_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
                                                     TEST_FILE_NAME.replace("csv", "npy"))
     transformed_object_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
@@ -47,12 +53,15 @@ class ModelTrainerConfig:
     trained_model_file_path: str = os.path.join(model_trainer_dir, MODEL_TRAINER_TRAINED_MODEL_NAME, MODEL_FILE_NAME)
     expected_accuracy: float = MODEL_TRAINER_EXPECTED_SCORE 
     model_config_file_path: str = MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+    search_cache_dir: str = MODEL_TRAINER_SEARCH_CACHE_DIR
 
 @dataclass
 class ModelEvaluationConfig:
     changed_threshold_score: float = MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    min_acceptable_f1: Optional[float] = MODEL_EVALUATION_MIN_ACCEPTABLE_F1
+    prediction_cache_dir: str = MODEL_EVALUATION_PREDICTION_CACHE_DIR
 
 
 @dataclass
@@ -1,15 +1,20 @@
 import sys
 
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
 from pandas import DataFrame
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
 
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 
 class TargetValueMapping:
     def __init__(self):
-        self.Certified:int = 0
-        self.Denied:int = 1
+        self.No:int = 0
+        self.Yes:int = 1
     def _asdict(self):
         return self.__dict__
     def reverse_mapping(self):
@@ -17,6 +22,82 @@ class TargetValueMapping:
         return dict(zip(mapping_response.values(),mapping_response.keys()))
     
 
+class CategoricalCodeEncoder(BaseEstimator, TransformerMixin):
+    """
+    Ordinal encoder backed by pandas' categorical hash table.
+    fit stores the sorted categories of each column; transform maps values to their
+    position in that list with pd.Categorical(...).codes. Unseen values and NaN become -1.
+    """
+    def fit(self, X: DataFrame, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.categories_ = [np.sort(X[column].dropna().unique()) for column in X.columns]
+        return self
+
+    def transform(self, X: DataFrame) -> np.ndarray:
+        X = pd.DataFrame(X)
+        max_categories = max((len(categories) for categories in self.categories_), default=0)
+        dtype = np.int8 if max_categories <= np.iinfo(np.int8).max else np.int32
+        out = np.empty((len(X), len(self.categories_)), dtype=dtype)
+        for i, categories in enumerate(self.categories_):
+            out[:, i] = pd.Categorical(X.iloc[:, i], categories=categories).codes
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_in_, dtype=object)
+
+
+class OneHotLookup:
+    """
+    Predict-time stand-in for a fitted OneHotEncoder(handle_unknown="ignore").
+    Each column's categories are kept sorted, so a whole batch column is encoded with one
+    np.searchsorted instead of a hash lookup per value, and the sparse one-hot matrix is
+    built directly from the codes. Unknown values get no column, as with the encoder.
+    """
+    def __init__(self, encoder: OneHotEncoder):
+        self.encoder = encoder
+        self.sort_orders = [np.argsort(categories, kind="stable") for categories in encoder.categories_]
+        self.sorted_categories = [categories[order] for categories, order in zip(encoder.categories_, self.sort_orders)]
+        sizes = [len(categories) for categories in encoder.categories_]
+        self.offsets = np.cumsum([0] + sizes[:-1])
+        self.n_outputs = sum(sizes)
+
+    @classmethod
+    def from_encoder(cls, encoder):
+        """
+        Build the lookup for `encoder`, or return None for configurations it does not reproduce:
+        dropped or infrequent categories, errors on unknown values, dense output, a missing-value
+        category, or categories that cannot be sorted.
+        """
+        if (not isinstance(encoder, OneHotEncoder) or encoder.handle_unknown != "ignore"
+                or encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False)
+                or not encoder.sparse_output):
+            return None
+        if any(pd.isna(categories).any() for categories in encoder.categories_):
+            return None
+        try:
+            return cls(encoder)
+        except TypeError:
+            return None
+
+    def transform(self, X: np.ndarray):
+        n_rows = X.shape[0]
+        row_indices, column_indices = [], []
+        try:
+            for i, (categories, order) in enumerate(zip(self.sorted_categories, self.sort_orders)):
+                values = X[:, i]
+                positions = np.minimum(np.searchsorted(categories, values), len(categories) - 1)
+                found = np.asarray(categories[positions] == values, dtype=bool)
+                row_indices.append(np.flatnonzero(found))
+                column_indices.append(self.offsets[i] + order[positions[found]])
+        except TypeError:
+            # A value that cannot be compared with the categories (e.g. a number among strings)
+            return self.encoder.transform(X)
+        row_indices = np.concatenate(row_indices)
+        data = np.ones(len(row_indices), dtype=self.encoder.dtype)
+        return sp.csr_matrix((data, (row_indices, np.concatenate(column_indices))), shape=(n_rows, self.n_outputs))
+
+
 class project1Model:
     def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
         """
@@ -26,6 +107,17 @@ class project1Model:
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
 
+    def _fitted_transformers(self) -> list:
+        # Fitted sub-transformers in output order with their input column names, one-hot encoders
+        # replaced by their OneHotLookup where possible; built once. Dropped and empty groups are skipped.
+        transformers = self.__dict__.get("_transformers")
+        if transformers is None:
+            transformers = [(OneHotLookup.from_encoder(transformer) or transformer, transformer_columns)
+                            for _, transformer, transformer_columns in self.preprocessing_object.transformers_
+                            if not isinstance(transformer, str) and len(transformer_columns)]
+            self.__dict__["_transformers"] = transformers
+        return transformers
+
     def predict(self, dataframe: DataFrame) -> DataFrame:
         """
         Function accepts raw inputs and then transformed raw input using preprocessing_object
@@ -45,6 +137,29 @@ class project1Model:
         except Exception as e:
             raise custom_exception(e, sys) from e
 
+    def predict_columns(self, columns: dict) -> np.ndarray:
+        """
+        Same as `predict`, for raw feature values held one 1-D array per column (column name ->
+        array, all the same length). Each fitted sub-transformer receives one block stacked from
+        just its own columns, so numeric transformers get a contiguous float block instead of a
+        slice of mixed-type rows.
+        """
+        try:
+            blocks = [transformer.transform(np.column_stack([columns[c] for c in transformer_columns]))
+                      for transformer, transformer_columns in self._fitted_transformers()]
+            return self._predict_blocks(blocks)
+
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    def _predict_blocks(self, blocks: list) -> np.ndarray:
+        # Stack the sub-transformer outputs as ColumnTransformer.transform would, then predict
+        if self.preprocessing_object.sparse_output_:
+            transformed_feature = sp.hstack(blocks, format="csr")
+        else:
+            transformed_feature = np.hstack([b.toarray() if sp.issparse(b) else b for b in blocks])
+        return self.trained_model_object.predict(transformed_feature)
+
     def __repr__(self):
         return f"{type(self.trained_model_object).__name__}()"
 
@@ -1,11 +1,33 @@
+import os
 import sys
+import gzip
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
 from pandas import DataFrame
 
 from AIML_1013_Project1.cloud_storage.aws_storage import SimpleStorageService
+from AIML_1013_Project1.constants import MODEL_CACHE_TTL
 from AIML_1013_Project1.exceptions import custom_exception
+from AIML_1013_Project1.logger import logging
 from AIML_1013_Project1.entity.estimator import project1Model
 
 
+# Held while a model is checked or fetched, so concurrent first requests wait for one download
+_MODEL_LOCK = threading.Lock()
+
+# (bucket, key) -> (monotonic time of the last ETag check, ETag seen then)
+_MODEL_VERSIONS = {}
+
+
+@lru_cache(maxsize=4)
+def _cached_model(bucket_name: str, model_path: str, etag: str) -> project1Model:
+    # Loaded models shared by every estimator in the process, keyed by S3 location and version
+    return SimpleStorageService().load_model(model_path, bucket_name=bucket_name)
+
+
 class project1Estimator:
     """
     Manage persistence and inference for a Telco churn model stored in S3.
@@ -14,8 +36,12 @@ class project1Estimator:
     -----
     - This class does not alter or wrap the model's API; it simply defers to
       `TelcoModel.predict(dataframe=...)` for inference once the model is loaded.
-    - The first call to `predict(...)` triggers a lazy load of the model if it
-      has not already been loaded via `load_model()`.
+    - Every `predict(...)` call goes through `load_model()`, which serves the model
+      from a per-process cache keyed by (bucket, key, ETag): long-lived estimators
+      (e.g. the web app's) share it without an S3 GET per request.
+    - The ETag is re-checked at most every `MODEL_CACHE_TTL` seconds, and `save_model`
+      drops the cache, so a newly pushed model replaces the old one without a restart.
+      Call `warmup()` at process start to take the load off the first request.
 
     Parameters
     ----------
@@ -29,11 +55,12 @@ class project1Estimator:
     bucket_name : str
         Target S3 bucket for model storage.
     s3 : SimpleStorageService
-        Helper client for S3 interactions (upload, load, existence checks).
+        Helper client for S3 interactions (upload, load, existence checks), created on
+        first use so that building an estimator needs no AWS credentials.
     model_path : str
         S3 key to the model file.
     loaded_model : TelcoModel or None
-        Cached in-memory model instance. Loaded on demand.
+        The model used by the most recent load or prediction.
     """
 
     def __init__(self, bucket_name, model_path,):
@@ -48,10 +75,16 @@ class project1Estimator:
             Location (S3 key) of your model in the bucket.
         """
         self.bucket_name = bucket_name
-        self.s3 = SimpleStorageService()
+        self._s3 = None
         self.model_path = model_path
         self.loaded_model: project1Model = None
 
+    @property
+    def s3(self) -> SimpleStorageService:
+        if self._s3 is None:
+            self._s3 = SimpleStorageService()
+        return self._s3
+
     def is_model_present(self, model_path):
         """
         Check whether a model artifact exists at the given S3 key.
@@ -72,11 +105,20 @@ class project1Estimator:
           and returns False to indicate absence or error.
         """
         try:
-            return self.s3.s3_key_path_available(bucket_name=self.bucket_name, s3_key=model_path)
+            return self.s3.s3_object_exists(bucket_name=self.bucket_name, s3_key=model_path)
         except custom_exception as e:
             print(e)
             return False
 
+    def get_model_etag(self):
+        """
+        Return the S3 ETag of the stored model, or None if no model exists at `self.model_path`.
+
+        The ETag changes whenever the object is overwritten, so it identifies the model
+        version without downloading it.
+        """
+        return self.s3.get_object_etag(bucket_name=self.bucket_name, s3_key=self.model_path)
+
     def load_model(self,) -> project1Model:
         """
         Load the model from S3 using the configured bucket and key.
@@ -88,12 +130,56 @@ class project1Estimator:
 
         Notes
         -----
-        - This method does not cache the model on its own. The `predict(...)`
-          method will cache the loaded instance in `self.loaded_model` when first used.
+        - The model is fetched once per process for each (bucket, key, ETag) and shared by
+          all estimators. The ETag (one HEAD request) is checked again once the last check
+          is `MODEL_CACHE_TTL` seconds old; a changed ETag loads the new model.
+          `save_model` clears the cache.
+        - The HEAD request runs outside the lock, by one caller per TTL period; the others
+          keep using the loaded model meanwhile. If it fails while a model is loaded, that
+          model keeps being served (with a warning) until the next check.
+        """
+        location = (self.bucket_name, self.model_path)
+        with _MODEL_LOCK:
+            checked_at, etag = _MODEL_VERSIONS.get(location, (None, None))
+            now = time.monotonic()
+            recheck = checked_at is None or now - checked_at >= MODEL_CACHE_TTL
+            if recheck and etag is not None:
+                # Claim this check, so concurrent callers do not send the same HEAD request
+                _MODEL_VERSIONS[location] = (now, etag)
+
+        if recheck:
+            try:
+                latest_etag = self.get_model_etag()
+            except Exception as e:
+                if etag is None:
+                    raise
+                logging.warning(f"Could not check the model version in S3, serving the loaded model: {e}")
+                latest_etag = etag
+
+            with _MODEL_LOCK:
+                if latest_etag != etag:
+                    # Replaced (or first seen): earlier versions are not needed any more
+                    _cached_model.cache_clear()
+                if latest_etag is None:
+                    # No model yet: check again on the next call rather than after the TTL
+                    _MODEL_VERSIONS.pop(location, None)
+                else:
+                    _MODEL_VERSIONS[location] = (now, latest_etag)
+            etag = latest_etag
+
+        with _MODEL_LOCK:
+            return _cached_model(self.bucket_name, self.model_path, etag)
+
+    def warmup(self) -> None:
+        """
+        Load the model into the process-wide cache ahead of the first prediction.
         """
-        return self.s3.load_model(self.model_path, bucket_name=self.bucket_name)
+        try:
+            self.loaded_model = self.load_model()
+        except Exception as e:
+            raise custom_exception(e, sys)
 
-    def save_model(self, from_file, remove: bool = False) -> None:
+    def save_model(self, from_file, remove: bool = False, transfer_config=None, gzip_level: int = None) -> None:
         """
         Upload a local model artifact to S3 at `self.model_path`.
 
@@ -103,6 +189,11 @@ class project1Estimator:
             Local filesystem path to the model file to upload.
         remove : bool, optional (default=False)
             If True, remove the local file after successful upload.
+        transfer_config : boto3.s3.transfer.TransferConfig, optional
+            Multipart settings for this upload; the storage service default is used if None.
+        gzip_level : int, optional
+            If given, the file is gzip-compressed at this level before upload. joblib
+            detects the compression when the model is loaded back.
 
         Raises
         ------
@@ -110,12 +201,33 @@ class project1Estimator:
             Wraps and re-raises any underlying exceptions thrown during upload.
         """
         try:
-            self.s3.upload_file(
-                from_file,
-                to_filename=self.model_path,
-                bucket_name=self.bucket_name,
-                remove=remove,
-            )
+            upload_from = from_file
+            if gzip_level is not None:
+                # Compress into a temporary file; the original is left untouched
+                with open(from_file, "rb") as src, tempfile.NamedTemporaryFile(suffix=".gz", delete=False) as tmp:
+                    with gzip.GzipFile(fileobj=tmp, mode="wb", compresslevel=gzip_level) as dst:
+                        shutil.copyfileobj(src, dst, length=1024 * 1024)
+                upload_from = tmp.name
+
+            try:
+                self.s3.upload_file(
+                    upload_from,
+                    to_filename=self.model_path,
+                    bucket_name=self.bucket_name,
+                    remove=False,
+                    transfer_config=transfer_config,
+                )
+            finally:
+                if upload_from != from_file:
+                    os.remove(upload_from)
+
+            # Models loaded in this process are now stale
+            with _MODEL_LOCK:
+                _cached_model.cache_clear()
+                _MODEL_VERSIONS.clear()
+
+            if remove:
+                os.remove(from_file)
         except Exception as e:
             raise custom_exception(e, sys)
 
@@ -142,12 +254,22 @@ class project1Estimator:
 
         Notes
         -----
-        - If `self.loaded_model` is None, the model is loaded from S3 via `load_model()`
-          before prediction. The loaded instance is cached for subsequent calls.
+        - The model is taken from `load_model()` on every call, so a model replaced in S3
+          is used as soon as the cache picks it up.
         """
         try:
-            if self.loaded_model is None:
-                self.loaded_model = self.load_model()
+            self.loaded_model = self.load_model()
             return self.loaded_model.predict(dataframe=dataframe)
+        except Exception as e:
+            raise custom_exception(e, sys)
+
+    def predict_columns(self, columns: dict):
+        """
+        Generate predictions for raw feature values held one array per column
+        (see `TelcoModel.predict_columns`).
+        """
+        try:
+            self.loaded_model = self.load_model()
+            return self.loaded_model.predict_columns(columns)
         except Exception as e:
             raise custom_exception(e, sys)
\ No newline at end of file
@@ -3,9 +3,11 @@ Module: telco_prediction.py
 
 Purpose:
     Provides two classes for inference in the Telco Churn project:
-      • TelcoData – wraps raw feature inputs into a structured format
-        (dictionary or DataFrame) for model consumption.
+      • TelcoData – turns raw feature inputs (e.g. a submitted form) into the
+        single-row input array the batcher stages for the model.
       • TelcoClassifier – loads the trained Telco model from S3 and generates predictions.
+      • project1PredictionBatcher – coalesces concurrent single-row requests into one
+        classifier call.
 
 Notes:
     - This module assumes preprocessing (encoding, scaling) matches the training pipeline.
@@ -13,13 +15,53 @@ Notes:
 """
 
 import sys
+import asyncio
+import warnings
+import numpy as np
 from pandas import DataFrame
+from threadpoolctl import threadpool_limits
+from AIML_1013_Project1.constants import PREDICTION_MAX_BATCH_SIZE, PREDICTION_MAX_LATENCY
 from AIML_1013_Project1.entity.config_entity import project1PredictorConfig
 from AIML_1013_Project1.entity.s3_estimator import project1Estimator
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 
 
+# Model input columns, in the order of project1Data's constructor arguments
+_COLS = (
+    "SeniorCitizen", "Dependents", "tenure", "MultipleLines", "InternetService", "OnlineSecurity",
+    "TechSupport", "StreamingTV", "StreamingMovies", "Contract", "PaperlessBilling", "PaymentMethod",
+    "MonthlyCharges", "TotalCharges",
+)
+
+# Positions in _COLS of the values converted to numbers, as in project1Data.__init__
+_INT_POSITIONS = tuple(_COLS.index(column) for column in ("SeniorCitizen",))
+_FLOAT_POSITIONS = tuple(_COLS.index(column) for column in ("tenure", "MonthlyCharges", "TotalCharges"))
+
+
+class _InputBatch:
+    """
+    Structure-of-arrays staging buffer for batched predictions: one array per model input
+    column, sized for a full batch and reused for every batch. SeniorCitizen is stored as
+    int64, the charges and tenure as float64 and the categorical strings as objects.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.columns = {}
+        for i, column in enumerate(_COLS):
+            dtype = np.int64 if i in _INT_POSITIONS else np.float64 if i in _FLOAT_POSITIONS else object
+            self.columns[column] = np.empty(capacity, dtype=dtype)
+
+    def write(self, i: int, row: np.ndarray) -> None:
+        """Store a single-row input array (see `project1Data.input_array_from_mapping`) at position `i`."""
+        for column, value in zip(self.columns.values(), row[0]):
+            column[i] = value
+
+    def view(self, n_rows: int) -> dict:
+        """The first `n_rows` entries of every column (views, no copy)."""
+        return {column: values[:n_rows] for column, values in self.columns.items()}
+
+
 class project1Data:
     def __init__(self,
                  SeniorCitizen: int,
@@ -61,78 +103,58 @@ class project1Data:
             Payment method used by the customer.
         MonthlyCharges, TotalCharges : float
             Monthly and total charges for the customer.
-        """
-        try:
-            self.SeniorCitizen = int(SeniorCitizen)
-            self.Dependents = Dependents
-            self.tenure = float(tenure)
-            self.MultipleLines = MultipleLines
-            self.InternetService = InternetService
-            self.OnlineSecurity = OnlineSecurity
-            self.TechSupport = TechSupport
-            self.StreamingTV = StreamingTV
-            self.StreamingMovies = StreamingMovies
-            self.Contract = Contract
-            self.PaperlessBilling = PaperlessBilling
-            self.PaymentMethod = PaymentMethod
-            self.MonthlyCharges = float(MonthlyCharges)
-            self.TotalCharges = float(TotalCharges)
-
-            # Basic numeric validation
-            for attr_name in ["tenure", "MonthlyCharges", "TotalCharges"]:
-                val = getattr(self, attr_name)
-                if not isinstance(val, (int, float)):
-                    raise ValueError(f"{attr_name} must be numeric, got {type(val)}")
 
-        except Exception as e:
-            raise custom_exception(e, sys) from e
-
-    def get_project1_input_data_frame(self) -> DataFrame:
+        Raises
+        ------
+        ValueError, TypeError
+            If a numeric field cannot be converted; translated into `custom_exception`
+            by the application's exception handler.
         """
-        Convert TelcoData instance into a pandas DataFrame.
+        # The int()/float() conversions are the numeric validation: they either succeed or raise
+        self.SeniorCitizen = int(SeniorCitizen)
+        self.Dependents = Dependents
+        self.tenure = float(tenure)
+        self.MultipleLines = MultipleLines
+        self.InternetService = InternetService
+        self.OnlineSecurity = OnlineSecurity
+        self.TechSupport = TechSupport
+        self.StreamingTV = StreamingTV
+        self.StreamingMovies = StreamingMovies
+        self.Contract = Contract
+        self.PaperlessBilling = PaperlessBilling
+        self.PaymentMethod = PaymentMethod
+        self.MonthlyCharges = float(MonthlyCharges)
+        self.TotalCharges = float(TotalCharges)
 
-        Returns
-        -------
-        pandas.DataFrame
-            A single-row DataFrame with column names matching model input schema.
+    @staticmethod
+    def input_array_from_mapping(values) -> np.ndarray:
         """
-        try:
-            project1_input_dict = self.get_project1_data_as_dict()
-            return DataFrame(project1_input_dict)
-        except Exception as e:
-            raise custom_exception(e, sys) from e
+        Build the single-row input array straight from a mapping of raw values (e.g. a
+        submitted form), without creating a project1Data instance.
 
-    def get_project1_data_as_dict(self) -> dict:
-        """
-        Convert the TelcoData instance to a dictionary.
+        Parameters
+        ----------
+        values : Mapping
+            Raw feature values keyed by column name.
 
         Returns
         -------
-        dict
-            Dictionary with feature names as keys and single-element lists as values.
+        numpy.ndarray
+            Array of shape (1, 14), columns in the order of `_COLS`, with SeniorCitizen
+            as int and tenure, MonthlyCharges and TotalCharges as float.
+
+        Raises
+        ------
+        ValueError, TypeError
+            If a numeric field is missing or not a number.
         """
-        logging.info("Entered get_telco_data_as_dict method of TelcoData class.")
-        try:
-            input_data = {
-                "SeniorCitizen": [self.SeniorCitizen],
-                "Dependents": [self.Dependents],
-                "tenure": [self.tenure],
-                "MultipleLines": [self.MultipleLines],
-                "InternetService": [self.InternetService],
-                "OnlineSecurity": [self.OnlineSecurity],
-                "TechSupport": [self.TechSupport],
-                "StreamingTV": [self.StreamingTV],
-                "StreamingMovies": [self.StreamingMovies],
-                "Contract": [self.Contract],
-                "PaperlessBilling": [self.PaperlessBilling],
-                "PaymentMethod": [self.PaymentMethod],
-                "MonthlyCharges": [self.MonthlyCharges],
-                "TotalCharges": [self.TotalCharges],
-            }
-            logging.info("Created Telco data dictionary successfully.")
-            return input_data
-        except Exception as e:
-            raise custom_exception(e, sys) from e
+        row = np.empty((1, len(_COLS)), dtype=object)
+        row[0] = [values.get(column) for column in _COLS]
+        for i in _INT_POSITIONS:
+            row[0, i] = int(row[0, i])
+        for i in _FLOAT_POSITIONS:
+            row[0, i] = float(row[0, i])
+        return row
 
 
 class project1Classifier:
@@ -145,22 +167,41 @@ class project1Classifier:
         prediction_pipeline_config : TelcoPredictorConfig, optional
             Configuration with S3 bucket and model file path.
             If not provided, a default instance will be created.
+
+        Notes
+        -----
+        The estimator is created once and reused by every `predict` call; the model itself
+        is fetched from S3 on first use (or by `warmup`) and then kept in memory.
         """
         try:
             if prediction_pipeline_config is None:
                 prediction_pipeline_config = project1PredictorConfig()
             self.prediction_pipeline_config = prediction_pipeline_config
+            self._estimator = project1Estimator(
+                bucket_name=prediction_pipeline_config.model_bucket_name,
+                model_path=prediction_pipeline_config.model_file_path,
+            )
+        except Exception as e:
+            raise custom_exception(e, sys) from e
+
+    def warmup(self) -> None:
+        """
+        Load the model ahead of the first prediction.
+        """
+        try:
+            self._estimator.warmup()
         except Exception as e:
             raise custom_exception(e, sys) from e
 
-    def predict(self, dataframe: DataFrame):
+    def predict(self, dataframe):
         """
         Run churn prediction using the Telco model stored in S3.
 
         Parameters
         ----------
-        dataframe : pandas.DataFrame
-            Feature data structured like the training dataset.
+        dataframe : pandas.DataFrame or dict
+            Feature data structured like the training dataset, or one array of
+            raw values per column name (see `_InputBatch.view`).
 
         Returns
         -------
@@ -170,16 +211,109 @@ class project1Classifier:
         Raises
         ------
         custom_exception
-            If model loading or prediction fails.
+            If model loading or prediction fails (raised by the estimator).
         """
-        try:
-            logging.info("Entered predict method of TelcoClassifier class.")
-            model = project1Estimator(
-                bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                model_path=self.prediction_pipeline_config.model_file_path,
-            )
-            result = model.predict(dataframe)
-            logging.info("Prediction completed successfully.")
-            return result
-        except Exception as e:
-            raise custom_exception(e, sys) from e
\ No newline at end of file
+        logging.info("Entered predict method of TelcoClassifier class.")
+        if isinstance(dataframe, dict):
+            result = self._estimator.predict_columns(dataframe)
+        else:
+            result = self._estimator.predict(dataframe)
+        logging.info("Prediction completed successfully.")
+        return result
+
+
+class project1PredictionBatcher:
+    def __init__(self, classifier: project1Classifier, max_batch_size: int = PREDICTION_MAX_BATCH_SIZE,
+                 max_latency: float = PREDICTION_MAX_LATENCY) -> None:
+        """
+        Micro-batch concurrent predictions into single classifier calls.
+
+        Parameters
+        ----------
+        classifier : TelcoClassifier
+            Classifier that scores each batch.
+        max_batch_size : int
+            Most rows scored in one call.
+        max_latency : float
+            Longest time (seconds) the first request of a batch waits for others to join.
+
+        Notes
+        -----
+        Must be started from a running event loop (`start`); the classifier runs in the
+        loop's default executor so the loop keeps accepting requests meanwhile. Starting
+        the batcher also limits the worker's BLAS/OpenMP pools to one thread.
+        """
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue = None
+        self._task = None
+        # Rows of the batch being scored are copied here, one typed array per column
+        self._staging = _InputBatch(max_batch_size)
+
+    def start(self) -> None:
+        """Start the background task that drains and scores the queue."""
+        # predict_columns hands the sub-transformers (fitted on DataFrames) plain arrays stacked
+        # in their fitted column order on purpose, so sklearn's missing-feature-names warning
+        # does not apply to the batches scored here
+        warnings.filterwarnings("ignore", message="X does not have valid feature names",
+                                category=UserWarning, module=r"sklearn\.")
+        # One BLAS/OpenMP thread per worker, set once for the worker's lifetime: the batches are
+        # small and every worker process scores its own, so per-core thread pools would only
+        # oversubscribe the CPUs
+        threadpool_limits(limits=1)
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, row: np.ndarray):
+        """
+        Score one input row (see `project1Data.input_array_from_mapping`) and return its prediction.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _next_batch(self) -> list:
+        # Block for the first request, then collect more until the batch is full or the deadline passes
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            try:
+                # The buffer is only rewritten after the previous batch's prediction has returned
+                for i, (row, _) in enumerate(batch):
+                    self._staging.write(i, row)
+                predictions = await loop.run_in_executor(None, self.classifier.predict,
+                                                         self._staging.view(len(batch)))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            logging.info("Scored a batch of %s rows", len(batch))
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
@@ -13,6 +13,8 @@ Run the Telco Churn machine-learning pipeline end-to-end:
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from AIML_1013_Project1.exceptions import custom_exception
 from AIML_1013_Project1.logger import logging
 
@@ -209,6 +211,7 @@ class TrainPipeline:
         self,
         data_ingestion_artifact: DataIngestionArtifact,
         model_trainer_artifact: ModelTrainerArtifact,
+        model_evaluation: Optional[ModelEvaluation] = None,
     ) -> ModelEvaluationArtifact:
         """
         Start the model evaluation stage.
@@ -219,6 +222,9 @@ class TrainPipeline:
             Provides the test dataset path for evaluation.
         model_trainer_artifact : ModelTrainerArtifact
             Provides the candidate model path and its training metrics.
+        model_evaluation : ModelEvaluation, optional
+            An evaluation created earlier (e.g. to prefetch production model predictions);
+            it is completed with `model_trainer_artifact`. A new one is created if None.
 
         Returns
         -------
@@ -231,11 +237,14 @@ class TrainPipeline:
             If evaluation fails for any reason.
         """
         try:
-            model_evaluation = ModelEvaluation(
-                model_eval_config=self.model_evaluation_config,
-                data_ingestion_artifact=data_ingestion_artifact,
-                model_trainer_artifact=model_trainer_artifact,
-            )
+            if model_evaluation is None:
+                model_evaluation = ModelEvaluation(
+                    model_eval_config=self.model_evaluation_config,
+                    data_ingestion_artifact=data_ingestion_artifact,
+                    model_trainer_artifact=model_trainer_artifact,
+                )
+            else:
+                model_evaluation.model_trainer_artifact = model_trainer_artifact
             model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
             return model_evaluation_artifact
         except Exception as e:
@@ -280,6 +289,10 @@ class TrainPipeline:
         --------
         Ingestion → Validation → Transformation → Training → Evaluation → (conditional) Pushing
 
+        The only branch independent of training is scoring the test set with the current
+        production model, so it runs in a background thread from right after ingestion
+        until evaluation needs it.
+
         Behavior
         --------
         If the newly trained model is not accepted during evaluation, the method exits early.
@@ -292,19 +305,32 @@ class TrainPipeline:
         """
         try:
             data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(
-                data_ingestion_artifact=data_ingestion_artifact
-            )
-            data_transformation_artifact = self.start_data_transformation(
+
+            # The trainer artifact is filled in once training is done
+            model_evaluation = ModelEvaluation(
+                model_eval_config=self.model_evaluation_config,
                 data_ingestion_artifact=data_ingestion_artifact,
-                data_validation_artifact=data_validation_artifact,
-            )
-            model_trainer_artifact = self.start_model_trainer(
-                data_transformation_artifact=data_transformation_artifact
+                model_trainer_artifact=None,
             )
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                prefetch_future = executor.submit(model_evaluation.prefetch_best_model_predictions)
+
+                data_validation_artifact = self.start_data_validation(
+                    data_ingestion_artifact=data_ingestion_artifact
+                )
+                data_transformation_artifact = self.start_data_transformation(
+                    data_ingestion_artifact=data_ingestion_artifact,
+                    data_validation_artifact=data_validation_artifact,
+                )
+                model_trainer_artifact = self.start_model_trainer(
+                    data_transformation_artifact=data_transformation_artifact
+                )
+                prefetch_future.result()
+
             model_evaluation_artifact = self.start_model_evaluation(
                 data_ingestion_artifact=data_ingestion_artifact,
                 model_trainer_artifact=model_trainer_artifact,
+                model_evaluation=model_evaluation,
             )
 
             if not model_evaluation_artifact.is_model_accepted:
@@ -1,8 +1,15 @@
 import os  # Lets us work with folders and files
 import sys  # Helps track errors and system info
+import mmap  # Lets us read a whole file through memory without copying it
+import hashlib  # Used to fingerprint file contents
+import threading  # Used to guard the set of folders already created
 import numpy as np  # Used for working with arrays and numeric data
-import dill  # Used to save and load Python objects like models or transformers
+import joblib  # Used to save and load Python objects like models or transformers
 import yaml  # Used to read and write settings files
+from functools import lru_cache  # Used to remember results of repeated calls
+import pandas as pd  # Used to convert table columns to smaller types
+import pyarrow.csv as pa_csv  # Fast CSV reader
+import pyarrow.parquet as pq  # Used to write Parquet files
 from pandas import DataFrame  # Used to label a table of data in function inputs
 
 # Custom code for logging and error messages
@@ -11,9 +18,22 @@ from AIML_1013_Project1.logger import logging
 
 ########################################################################################
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=64)
+def _parse_yaml_file(file_path: str, mtime_ns: int, size: int) -> dict:
+    # Cached per (path, modification time, size): an edited file gets a new entry
+    with open(file_path, "rb") as yaml_file:
+        return yaml.load(yaml_file, Loader=_YamlLoader)
+
+
 def read_yaml_file(file_path: str) -> dict:
     """
     Opens a YAML file (usually a settings or config file) and loads the data.
+    The file is only parsed again when it has changed on disk; otherwise later calls
+    return the same dictionary, so treat it as read-only.
 
     Args:
         file_path (str): The location of the YAML file on your computer.
@@ -22,9 +42,9 @@ def read_yaml_file(file_path: str) -> dict:
         dict: A dictionary that holds all the values from the YAML file.
     """
     try:
-        # Open the file in read mode and load its contents
-        with open(file_path, "rb") as yaml_file:
-            return yaml.safe_load(yaml_file)
+        # Check the file's modification time and size, then load its contents (or reuse them)
+        stat = os.stat(file_path)
+        return _parse_yaml_file(file_path, stat.st_mtime_ns, stat.st_size)
 
     # If something goes wrong, raise a detailed error message
     except Exception as e:
@@ -32,6 +52,52 @@ def read_yaml_file(file_path: str) -> dict:
 
 ########################################################################################
 
+# Folders this process has already created (or found), so later saves into them skip os.makedirs
+_ensured_dirs: set = set()
+_ensured_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(dir_path: str) -> None:
+    """
+    Creates a folder (and its parents) if it doesn't exist, at most once per folder per process.
+    os.makedirs checks every part of the path on disk, which adds up when many files are saved
+    into the same few folders, especially on a network filesystem.
+
+    Args:
+        dir_path (str): The folder to create. An empty path (the current folder) is ignored.
+    """
+    # Already done (set lookups are safe without the lock)
+    if not dir_path or dir_path in _ensured_dirs:
+        return
+
+    with _ensured_dirs_lock:
+        if dir_path not in _ensured_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            _ensured_dirs.add(dir_path)
+
+########################################################################################
+
+def _to_builtin(value):
+    """
+    Turns NumPy numbers and arrays into plain Python numbers and lists, so they can be
+    written to YAML or JSON like any other value.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class _YamlDumper(yaml.Dumper):
+    """YAML writer that stores NumPy values as plain numbers/lists instead of Python object tags."""
+
+
+_YamlDumper.add_multi_representer(np.generic, lambda dumper, value: dumper.represent_data(_to_builtin(value)))
+_YamlDumper.add_representer(np.ndarray, lambda dumper, value: dumper.represent_data(_to_builtin(value)))
+
+########################################################################################
+
 def write_yaml_file(file_path: str, content: object, replace: bool = False) -> None:
     """
     Saves a dictionary (or other Python object) into a YAML file.
@@ -48,23 +114,25 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
                 os.remove(file_path)
 
         # Make sure the folder exists before we try to save the file
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(file_path))
 
         # Write the content to the YAML file
         with open(file_path, 'w') as file:
-            yaml.dump(content, file)
+            yaml.dump(content, file, Dumper=_YamlDumper)
 
     except Exception as e:
         raise custom_exception(e, sys) from e
 
 ########################################################################################
 
-def load_object(file_path: str) -> object:
+def load_object(file_path: str, mmap_mode: str = None) -> object:
     """
     Opens a saved Python object (like a trained model) from a file.
 
     Args:
         file_path (str): Path to the file.
+        mmap_mode (str): If set (e.g. "r"), the NumPy arrays inside the object are
+            memory-mapped from the file instead of read into memory.
 
     Returns:
         object: The object that was stored (like a model or settings).
@@ -72,9 +140,8 @@ def load_object(file_path: str) -> object:
     logging.info("Entered the load_object method of utils")
 
     try:
-        # Open the file and load the object from it
-        with open(file_path, "rb") as file_obj:
-            obj = dill.load(file_obj)
+        # Load from the path (not an open file object), so joblib can memory-map the arrays
+        obj = joblib.load(file_path, mmap_mode=mmap_mode)
 
         logging.info("Exited the load_object method of utils")
         return obj
@@ -88,6 +155,10 @@ def save_numpy_array_data(file_path: str, array: np.array):
     """
     Saves a NumPy array (like a table of numbers) to a file.
 
+    2-D arrays are always stored column-major (Fortran order): each column is one
+    contiguous block on disk and in a memory-mapped load, which is what column-wise
+    work such as model fitting or splitting off the target column reads.
+
     Args:
         file_path (str): Where the file should be saved.
         array (np.array): The data you want to save.
@@ -97,31 +168,42 @@ def save_numpy_array_data(file_path: str, array: np.array):
         dir_path = os.path.dirname(file_path)
 
         # Create the folder if it doesn't exist
-        os.makedirs(dir_path, exist_ok=True)
+        _ensure_dir(dir_path)
+
+        # No copy if the array is already column-major
+        array = np.asfortranarray(array)
 
         # Open the file and write the array to it in binary format
+        # (raw .npy header + bytes; object arrays are refused instead of being pickled)
         with open(file_path, 'wb') as file_obj:
-            np.save(file_obj, array)
+            np.save(file_obj, array, allow_pickle=False)
 
     except Exception as e:
         raise custom_exception(e, sys) from e
 
 ########################################################################################
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: str = "r", dtype=None) -> np.array:
     """
     Loads a NumPy array that was saved earlier.
 
     Args:
         file_path (str): Where the file is located.
+        mmap_mode (str): Memory-map mode. By default ("r") the file is mapped read-only,
+            so only the parts that are used get read from disk; pass None to copy the
+            whole array into memory instead (e.g. to modify it).
+        dtype: Optional dtype to return the array as. An array already stored with this
+            dtype is returned as is (still memory-mapped); others are converted in memory.
 
     Returns:
         np.array: The array data that was stored in the file.
     """
     try:
-        # Open the file and load the array from it
-        with open(file_path, 'rb') as file_obj:
-            return np.load(file_obj)
+        # Load the array from the file (memory-mapped when mmap_mode is given)
+        arr = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr
 
     except Exception as e:
         raise custom_exception(e, sys) from e
@@ -140,11 +222,15 @@ def save_object(file_path: str, obj: object) -> None:
 
     try:
         # Create the folder if it doesn’t exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(file_path))
 
-        # Save the object using dill
+        # Save the object using joblib: the NumPy arrays inside (fitted encoder categories,
+        # scaler statistics, model weights) are written out of the pickle stream as raw,
+        # aligned buffers, and the rest of the object graph is pickled with protocol 5.
+        # The file is left uncompressed so `load_object(..., mmap_mode="r")` can memory-map
+        # those buffers; the model pusher compresses the model for upload
         with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+            joblib.dump(obj, file_obj, compress=0, protocol=5)
 
         logging.info("Exited the save_object method of utils")
 
@@ -174,4 +260,106 @@ def drop_columns(df: DataFrame, cols: list) -> DataFrame:
         return df
 
     except Exception as e:
-        raise custom_exception(e, sys) from e
\ No newline at end of file
+        raise custom_exception(e, sys) from e
+
+########################################################################################
+
+def apply_schema_dtypes(df: DataFrame, schema_config: dict) -> DataFrame:
+    """
+    Converts columns to the compact types listed under the schema's "columns" section.
+    "category" columns become pandas categoricals; "int" and "float" columns are turned
+    into numbers (blank or bad entries become NaN) and downcast to the smallest type that
+    fits, e.g. float32 instead of float64.
+
+    Args:
+        df (DataFrame): The table to convert (changed in place and returned).
+        schema_config (dict): The parsed schema YAML.
+
+    Returns:
+        DataFrame: The same table with the smaller column types.
+    """
+    try:
+        # "columns" is a list of one-item {column: type} mappings
+        for column_types in schema_config["columns"]:
+            for column, column_type in column_types.items():
+                if column not in df.columns:
+                    continue
+                if column_type == "category":
+                    df[column] = df[column].astype("category")
+                elif column_type == "int":
+                    df[column] = pd.to_numeric(df[column], errors="coerce", downcast="integer")
+                elif column_type == "float":
+                    df[column] = pd.to_numeric(df[column], errors="coerce", downcast="float")
+        return df
+
+    except Exception as e:
+        raise custom_exception(e, sys) from e
+
+########################################################################################
+
+def get_parquet_sibling(file_path: str) -> str:
+    """
+    Returns the path of the Parquet copy that sits next to a data file, e.g.
+    "train.csv" -> "train.parquet". The copy may or may not exist.
+
+    Args:
+        file_path (str): Path of the original (usually CSV) file.
+
+    Returns:
+        str: Path of the Parquet sibling.
+    """
+    return os.path.splitext(file_path)[0] + ".parquet"
+
+########################################################################################
+
+def convert_csv_to_parquet(csv_file_path: str, parquet_file_path: str = None, return_table: bool = False):
+    """
+    Converts a CSV file to a zstd-compressed Parquet file, so later reads can skip CSV parsing
+    and load only the columns they need.
+
+    Args:
+        csv_file_path (str): The CSV file to convert.
+        parquet_file_path (str): Where to write the Parquet file. Defaults to the CSV path
+            with a .parquet extension.
+        return_table (bool): If True, return the Arrow table that was written instead of the
+            path, so a caller in the same process can use the data without reading it again.
+
+    Returns:
+        str or pyarrow.Table: The path of the Parquet file, or the table if return_table is True.
+    """
+    try:
+        if parquet_file_path is None:
+            parquet_file_path = get_parquet_sibling(csv_file_path)
+
+        # Parse with the multi-threaded Arrow reader and write the table straight out
+        table = pa_csv.read_csv(csv_file_path)
+        pq.write_table(table, parquet_file_path, compression="zstd")
+        return table if return_table else parquet_file_path
+
+    except Exception as e:
+        raise custom_exception(e, sys) from e
+
+########################################################################################
+
+def file_digest(file_path: str) -> str:
+    """
+    Computes a fingerprint (BLAKE2b hash) of a file's contents.
+    Two files with the same bytes get the same fingerprint, so it can be used as a cache key.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex string of the hash.
+    """
+    try:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as file_obj:
+            # mmap cannot map an empty file; the empty digest is returned for it
+            if os.fstat(file_obj.fileno()).st_size > 0:
+                with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise custom_exception(e, sys) from e
@@ -1,20 +1,25 @@
 # To test, open the terminal and use `python app.py`. Once it is running
 # paste http://127.0.0.1:8080/ into your browser
 
+import sys
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import fastapi
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.responses import HTMLResponse, RedirectResponse
 from uvicorn import run as app_run
 
-from typing import Optional
-
-from AIML_1013_Project1.constants import APP_HOST, APP_PORT
-from AIML_1013_Project1.pipeline.prediction_pipeline import project1Data, project1Classifier
+from AIML_1013_Project1.constants import APP_HOST, APP_PORT, APP_WORKERS
+from AIML_1013_Project1.exceptions import custom_exception
+from AIML_1013_Project1.logger import logging
+from AIML_1013_Project1.pipeline.prediction_pipeline import project1Data, project1Classifier, project1PredictionBatcher
 from AIML_1013_Project1.pipeline.training_pipeline import TrainPipeline
 
 app = FastAPI()
@@ -23,6 +28,21 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 templates = Jinja2Templates(directory='templates')
 
+# The result page only varies with the prediction text and, through url_for, the request's base
+# URL: each combination is rendered once and the HTML reused (capped, since the base URL comes
+# from the Host header)
+_PREDICTION_TEMPLATE = templates.get_template("project1.html")
+_PREDICTION_PAGES = {}
+_PREDICTION_PAGES_MAX = 32
+
+# Result text indexed by the predicted class (TargetValueMapping: No -> 0, Yes -> 1)
+_PREDICTION_STATUS = ("Not Churned", "Churned")
+
+# One classifier per worker process; the model is loaded on the first prediction and kept
+model_predictor = project1Classifier()
+# Concurrent predict requests are scored together in small batches
+prediction_batcher = project1PredictionBatcher(model_predictor)
+
 origins = ["*"]
 
 app.add_middleware(
@@ -36,37 +56,52 @@ app.add_middleware(
 class DataForm:
     def __init__(self, request: Request):
         self.request: Request = request
-        self.SeniorCitizen: Optional[str] = None
-        self.Dependents: Optional[str] = None
-        self.tenure: Optional[str] = None
-        self.MultipleLines: Optional[str] = None
-        self.InternetService: Optional[str] = None
-        self.OnlineSecurity: Optional[str] = None
-        self.TechSupport: Optional[str] = None
-        self.StreamingTV: Optional[str] = None
-        self.StreamingMovies: Optional[str] = None
-        self.Contract: Optional[str] = None
-        self.PaperlessBilling: Optional[str] = None
-        self.PaymentMethod: Optional[str] = None
-        self.MonthlyCharges: Optional[str] = None
-        self.TotalCharges: Optional[str] = None
+        # Model input row built from the submitted form (see project1Data.input_array_from_mapping)
+        self.row = None
 
     async def get_telco_data(self):
         form = await self.request.form()
-        self.SeniorCitizen = form.get("SeniorCitizen")
-        self.Dependents = form.get("Dependents")
-        self.tenure = form.get("tenure")
-        self.MultipleLines = form.get("MultipleLines")
-        self.InternetService = form.get("InternetService")
-        self.OnlineSecurity = form.get("OnlineSecurity")
-        self.TechSupport = form.get("TechSupport")
-        self.StreamingTV = form.get("StreamingTV")
-        self.StreamingMovies = form.get("StreamingMovies")
-        self.Contract = form.get("Contract")
-        self.PaperlessBilling = form.get("PaperlessBilling")
-        self.PaymentMethod = form.get("PaymentMethod")
-        self.MonthlyCharges = form.get("MonthlyCharges")
-        self.TotalCharges = form.get("TotalCharges")
+        self.row = project1Data.input_array_from_mapping(form)
+
+
+def render_prediction_page(request: Request, status: str) -> HTMLResponse:
+    key = (status, str(request.base_url))
+    body = _PREDICTION_PAGES.get(key)
+    if body is None:
+        if len(_PREDICTION_PAGES) >= _PREDICTION_PAGES_MAX:
+            _PREDICTION_PAGES.clear()
+        body = _PREDICTION_PAGES[key] = _PREDICTION_TEMPLATE.render(request=request, context=status)
+    return HTMLResponse(body)
+
+
+@app.exception_handler(Exception)
+async def handle_unexpected_error(request: Request, exc: Exception):
+    # The one place errors from the request path are translated, instead of a try/except in
+    # every method they pass through
+    error = exc if isinstance(exc, custom_exception) else custom_exception(exc, sys)
+    logging.error(str(error))
+    return JSONResponse({"status": False, "error": f"{exc}"})
+
+
+@app.on_event("startup")
+async def warm_up_model():
+    # Each worker loads its own copy of the model before serving, off the event loop. Without a
+    # model in S3 yet (before the first training run) it is loaded on the first prediction instead.
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, model_predictor.warmup)
+    except Exception as e:
+        logging.warning(f"Model warm-up failed, loading on first prediction: {e}")
+
+
+@app.on_event("startup")
+async def start_prediction_batcher():
+    prediction_batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_prediction_batcher():
+    await prediction_batcher.stop()
+
 
 @app.get("/", tags=["authentication"])
 async def index(request: Request):
@@ -80,7 +115,9 @@ async def trainRouteClient():
     try:
         train_pipeline = TrainPipeline()
 
-        train_pipeline.run_pipeline()
+        # Train on a worker thread so the event loop keeps serving predictions meanwhile
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            await asyncio.get_running_loop().run_in_executor(executor, train_pipeline.run_pipeline)
 
         return Response("Training successful !!")
 
@@ -90,50 +127,18 @@ async def trainRouteClient():
 
 @app.post("/")
 async def predictRouteClient(request: Request):
-    try:
-        form = DataForm(request)
-        await form.get_telco_data()
-        
-        project1_data = project1Data(
-            SeniorCitizen=form.SeniorCitizen,
-            Dependents=form.Dependents,
-            tenure=form.tenure,
-            MultipleLines=form.MultipleLines,
-            InternetService=form.InternetService,
-            OnlineSecurity=form.OnlineSecurity,
-            TechSupport=form.TechSupport,
-            StreamingTV=form.StreamingTV,
-            StreamingMovies=form.StreamingMovies,
-            Contract=form.Contract,
-            PaperlessBilling=form.PaperlessBilling,
-            PaymentMethod=form.PaymentMethod,
-            MonthlyCharges=form.MonthlyCharges,
-            TotalCharges=form.TotalCharges,
-        )
-
-        
-        project1_df = project1_data.get_project1_input_data_frame()
-
-        model_predictor = project1Classifier()
-
-        value = model_predictor.predict(dataframe=project1_df)[0]
-
-        status = None
-        if value == 1:
-            status = "Churned"
-        else:
-            status = "Not Churned"
-
-        return templates.TemplateResponse(
-            "project1.html",
-            {"request": request, "context": status},
-        )
-        
-    except Exception as e:
-        return {"status": False, "error": f"{e}"}
+    # Errors are turned into the {"status": False, ...} reply by handle_unexpected_error
+    form = DataForm(request)
+    await form.get_telco_data()
+
+    value = await prediction_batcher.predict(form.row)
+
+    return render_prediction_page(request, _PREDICTION_STATUS[int(value)])
 
 
 if __name__ == "__main__":
-    app_run(app, host=APP_HOST, port=APP_PORT)
+    # Workers are started from the import string; uvicorn[standard] brings uvloop/httptools,
+    # which it picks up automatically where supported
+    app_run("app:app", host=APP_HOST, port=APP_PORT, workers=APP_WORKERS)
 
     #activation 4
@@ -5,5 +5,7 @@ setup(
     version = "0.0.0",
     author = "B.Cramer", 
     author_email = "brandy-cramer@raider.rose.edu",
-    packages=find_packages()
+    packages=find_packages(),
+    # Artifact dataclasses use slots=True
+    python_requires=">=3.10",
     )
\ No newline at end of file
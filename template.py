@@ -1,55 +1,105 @@
 import os 
-from pathlib import Path
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 project_name = "telco_churn"
 
 
-list_files = [
-    f"{project_name}/__init__.py",
-    f"{project_name}/components/__init__.py",
-    f"{project_name}/components/data_ingestion.py",
-    f"{project_name}/components/data_validation.py",
-    f"{project_name}/components/data_transformation.py",
-    f"{project_name}/components/model_trainer.py",
-    f"{project_name}/components/model_evaluation.py",
-    f"{project_name}/components/model_pusher.py",
-    f"{project_name}/entity/__init__.py",
-    f"{project_name}/entity/articfact_entity.py",
-    f"{project_name}/entity/config_entity.py",
-    f"{project_name}/entity/estimator.py",
-    f"{project_name}/entity/s3_estimator.py",
-    f"{project_name}/pipeline/__init__.py",
-    f"{project_name}/pipeline/prediction_pipeline.py",
-    f"{project_name}/pipeline/training_pipeline.py", 
-    f"{project_name}/configuration/__init__.py",
-    f"{project_name}/configuration/aws_connection.py",
-    f"{project_name}/configuration/mongo_db_connect.py",
-    f"{project_name}/configuration/pine_cone_connect.py"
-    f"{project_name}/database_access/__init__.py",
-    f"{project_name}/database_access/mongo_extract",
-    f"{project_name}/database_access/pinecone_extract",
-    f"{project_name}/cloud_storage/__init__.py",
-    f"{project_name}/cloud_storage/aws_storage.py", 
-    f"{project_name}/exceptions/__init__.py",
-    f"{project_name}/logger/__init__.py",
-    f"{project_name}/utils/__init__.py",
-    "app.py", 
+# Package modules as (subpackage, filename); "" is the package root
+_ENTRIES = (
+    ("", "__init__.py"),
+    ("components", "__init__.py"),
+    ("components", "data_ingestion.py"),
+    ("components", "data_validation.py"),
+    ("components", "data_transformation.py"),
+    ("components", "model_trainer.py"),
+    ("components", "model_evaluation.py"),
+    ("components", "model_pusher.py"),
+    ("entity", "__init__.py"),
+    ("entity", "articfact_entity.py"),
+    ("entity", "config_entity.py"),
+    ("entity", "estimator.py"),
+    ("entity", "s3_estimator.py"),
+    ("pipeline", "__init__.py"),
+    ("pipeline", "prediction_pipeline.py"),
+    ("pipeline", "training_pipeline.py"),
+    ("configuration", "__init__.py"),
+    ("configuration", "aws_connection.py"),
+    ("configuration", "mongo_db_connect.py"),
+    ("configuration", "pine_cone_connect.py"),
+    ("database_access", "__init__.py"),
+    ("database_access", "mongo_extract.py"),
+    ("database_access", "pinecone_extract.py"),
+    ("cloud_storage", "__init__.py"),
+    ("cloud_storage", "aws_storage.py"),
+    ("exceptions", "__init__.py"),
+    ("logger", "__init__.py"),
+    ("utils", "__init__.py"),
+)
+
+# Files outside the package, relative to the project root
+TOP_LEVEL = (
+    "app.py",
     "requirements.txt",
     "DockerFile",
     ".dockerignore",
     "demo.py",
-    "setup.py", 
+    "setup.py",
     "config/model.yaml",
-    "config/schema.yaml"
-]
+    "config/schema.yaml",
+)
+
+list_files = [f"{project_name}/{sub}/{name}" if sub else f"{project_name}/{name}" for sub, name in _ENTRIES] + list(TOP_LEVEL)
+
+# Catches two entries run together by a missing comma (or a module without its extension)
+_malformed = [p for p in list_files if not p.endswith((".py", ".yaml", ".txt", "DockerFile", ".dockerignore"))]
+if _malformed:
+    raise ValueError(f"Unexpected template entries: {_malformed}")
+
+# Grouped by folder, so files in the same folder are created back to back
+list_files.sort(key=lambda p: (os.path.dirname(p), os.path.basename(p)))
+
+def _touch(filepath):
+    # Raw os.open/os.close: no Python file object is needed to create an empty file
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.close(fd)
+
+
+def create_template():
+    # Already scaffolded: one stat per file instead of listing every folder; a file that was
+    # deleted since is caught here and recreated below
+    if all(os.path.isfile(filepath) for filepath in list_files):
+        print('Template already in place')
+        return
 
-for filepath in list_files:
-    filepath = Path(filepath)
-    filedir, filename = os.path.split(filepath)
-    if filedir:
+    # Create each folder once, not once per file inside it
+    dirs = {os.path.dirname(filepath) for filepath in list_files if os.path.dirname(filepath)}
+    for filedir in dirs:
         os.makedirs(filedir, exist_ok=True)
-    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
-        with open(filepath, "w"):
-            pass
-    else:
-        print(f'File is already present at: {filepath}')    
\ No newline at end of file
+
+    # Sizes of everything already in those folders (and the current one), listed once per folder
+    existing = {}
+    for filedir in dirs | {""}:
+        with os.scandir(filedir or ".") as entries:
+            existing[filedir] = {entry.name: entry.stat().st_size for entry in entries}
+
+    to_create, already_present = [], []
+    for filepath in list_files:
+        filedir, filename = os.path.split(filepath)
+        # -1 if the file is missing
+        if existing[filedir].get(filename, -1) <= 0:
+            to_create.append(filepath)
+        else:
+            already_present.append(filepath)
+
+    # One write for the whole report instead of a print per file
+    if already_present:
+        sys.stdout.write("Files already present:\n  " + "\n  ".join(already_present) + "\n")
+
+    # The files are independent: create them concurrently so their open/close calls overlap
+    if to_create:
+        with ThreadPoolExecutor(max_workers=min(32, len(to_create))) as executor:
+            list(executor.map(_touch, to_create))
+
+
+create_template()